@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+TTS Audio Cache
+Disk-backed, size-capped LRU cache of synthesized speech.
+"""
+
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict
+
+
+class AudioCache:
+    """
+    Content-addressed cache of raw 16-bit PCM keyed by text, voice and speed.
+    Entries are stored zlib-compressed, one file per key; file modification
+    times record recency so LRU order survives restarts.
+    """
+
+    SUFFIX = ".pcm.z"
+
+    def __init__(self, cache_dir: Path, max_mb: float = 50):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> file size, oldest first
+        self._total_bytes = 0
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+        except OSError as e:
+            print(f"⚠ TTS cache unavailable: {e}")
+            self.max_bytes = 0
+
+    @staticmethod
+    def key(text: str, voice: str, speed: float) -> str:
+        """Cache key for a piece of text spoken with a given voice and speed."""
+        normalized = " ".join(text.split())
+        return hashlib.sha1(f"{voice}|{speed:.3f}|{normalized}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def _load_index(self):
+        """Rebuild the LRU index from the files already on disk."""
+        files = []
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path.name[:-len(self.SUFFIX)], stat.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        self._evict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached PCM for key, or None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            try:
+                pcm = zlib.decompress(path.read_bytes())
+                os.utime(path)  # Mark as recently used
+            except (OSError, zlib.error):
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pcm
+
+    def put(self, key: str, pcm: bytes):
+        """Store PCM under key, evicting least recently used entries if needed."""
+        if not pcm or self.max_bytes <= 0:
+            return
+
+        data = zlib.compress(pcm, 6)
+        if len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            path = self._path(key)
+            tmp_path = path.with_suffix(".tmp")
+            try:
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"TTS cache write error: {e}")
+                return
+
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        """Drop the oldest entries until the cache fits its size cap."""
+        while self._total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+            }
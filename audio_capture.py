@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Audio Capture Module
+A single always-open audio source (the microphone, or WAV files replayed
+for benchmarks) feeding a preallocated ring buffer, shared by wake word
+detection and command recording.
+"""
+
+import time
+import wave
+import threading
+import collections
+import numpy as np
+from typing import Optional, Callable, List, Tuple, Dict
+
+
+class AudioRingBuffer:
+    """
+    Fixed-capacity int16 ring buffer.
+    Samples are addressed by absolute position (total samples written so far),
+    so readers can keep their own cursors and start from any recent point.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.buffer = np.zeros(capacity, dtype=np.int16)
+        self.position = 0  # Total samples ever written
+        self._cond = threading.Condition()
+
+    @property
+    def oldest(self) -> int:
+        """Absolute position of the oldest sample still held."""
+        return max(0, self.position - self.capacity)
+
+    def write(self, samples: np.ndarray):
+        """Append samples, overwriting the oldest audio when full."""
+        count = len(samples)
+        if count > self.capacity:
+            samples = samples[-self.capacity:]
+
+        with self._cond:
+            start = (self.position + count - len(samples)) % self.capacity
+            first = min(len(samples), self.capacity - start)
+            self.buffer[start:start + first] = samples[:first]
+            self.buffer[:len(samples) - first] = samples[first:]
+            self.position += count
+            self._cond.notify_all()
+
+    def views(self, start: int, end: Optional[int] = None) -> Tuple[np.ndarray, ...]:
+        """
+        Zero-copy views of samples in [start, end), clipped to what is still held.
+        Returns one view, or two when the range wraps around the buffer end.
+        """
+        with self._cond:
+            end = self.position if end is None else min(end, self.position)
+            start = max(start, self.oldest)
+            if end <= start:
+                return ()
+
+            i = start % self.capacity
+            j = i + (end - start)
+            if j <= self.capacity:
+                return (self.buffer[i:j],)
+            return (self.buffer[i:], self.buffer[:j - self.capacity])
+
+    def read(self, start: int, end: Optional[int] = None) -> np.ndarray:
+        """Copy out samples in [start, end), clipped to what is still held."""
+        parts = self.views(start, end)
+        if not parts:
+            return np.zeros(0, dtype=np.int16)
+        if len(parts) == 1:
+            return parts[0].copy()
+        return np.concatenate(parts)
+
+    def read_float(self, start: int, end: Optional[int], out: np.ndarray) -> np.ndarray:
+        """
+        Convert samples in [start, end) to float32 in [-1, 1) straight into `out`.
+        No intermediate arrays are allocated; returns the filled slice of out.
+        """
+        filled = 0
+        for part in self.views(start, end):
+            n = min(len(part), len(out) - filled)
+            np.multiply(part[:n], 1.0 / 32768.0, out=out[filled:filled + n],
+                        dtype=np.float32)
+            filled += n
+        return out[:filled]
+
+    def wait(self, position: int, timeout: float) -> bool:
+        """Wait until audio beyond position has been written."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.position > position, timeout)
+
+
+class BlockQueue:
+    """
+    Bounded queue of audio blocks that drops the oldest block when full.
+    A consumer that falls behind then skips stale audio instead of lagging
+    further and further behind real time. Counts drops and the deepest the
+    queue has been.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._blocks = collections.deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.dropped = 0
+        self.high_water = 0
+
+    def put(self, block: np.ndarray):
+        with self._cond:
+            if len(self._blocks) == self.maxsize:
+                self.dropped += 1  # deque(maxlen) discards the oldest
+            self._blocks.append(block)
+            self.high_water = max(self.high_water, len(self._blocks))
+            self._cond.notify()
+
+    def get(self, timeout: float) -> Optional[np.ndarray]:
+        """Oldest queued block, or None if nothing arrives within timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._blocks, timeout):
+                return None
+            return self._blocks.popleft()
+
+    def clear(self):
+        with self._cond:
+            self._blocks.clear()
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+
+# Receives each block of 16-bit mono samples and the stream status (or None)
+BlockCallback = Callable[[np.ndarray, object], None]
+
+
+class AudioSource:
+    """
+    Base class for audio inputs.
+    start() begins delivering fixed-size blocks of 16-bit mono samples to
+    the callback from a background thread.
+    """
+
+    name = "audio source"
+
+    def start(self, callback: BlockCallback) -> bool:
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+
+class SoundDeviceSource(AudioSource):
+    """Live microphone input through sounddevice."""
+
+    def __init__(self, sd, sample_rate: int, channels: int, blocksize: int):
+        self.sd = sd
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.blocksize = blocksize
+        self.name = sd.query_devices(kind='input')['name']
+        self._stream = None
+
+    def start(self, callback: BlockCallback) -> bool:
+        def on_block(indata, frames, time, status):
+            # Keep the first channel only
+            callback(np.ascontiguousarray(indata[:, 0]), status)
+
+        try:
+            self._stream = self.sd.InputStream(
+                samplerate=self.sample_rate,
+                blocksize=self.blocksize,
+                dtype='int16',
+                channels=self.channels,
+                callback=on_block
+            )
+            self._stream.start()
+            return True
+        except Exception as e:
+            print(f"Could not open microphone stream: {e}")
+            self._stream = None
+            return False
+
+    def stop(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception:
+                pass
+            self._stream = None
+
+
+class WavFileSource(AudioSource):
+    """
+    Replays WAV files (16-bit mono at the capture rate) as if they came from
+    the microphone, paced at `speed` times real time (0 = as fast as
+    possible, for consumers that keep up, such as the ring buffer).
+    `pad_seconds` of silence follow each file so end-of-speech and
+    end-of-utterance logic can run; `finished` is set after the last block.
+    """
+
+    def __init__(self, paths: List[str], sample_rate: int, blocksize: int,
+                 speed: float = 1.0, pad_seconds: float = 1.0, loop: bool = False):
+        self.paths = list(paths)
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.speed = speed
+        self.pad = np.zeros(int(pad_seconds * sample_rate), dtype=np.int16)
+        self.loop = loop
+        self.name = f"replay of {len(self.paths)} file(s)"
+        self.finished = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def read(self, path: str) -> np.ndarray:
+        with wave.open(str(path), "rb") as w:
+            if w.getframerate() != self.sample_rate or w.getnchannels() != 1 or w.getsampwidth() != 2:
+                raise ValueError(f"{path}: expected {self.sample_rate} Hz mono 16-bit")
+            return np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+
+    def start(self, callback: BlockCallback) -> bool:
+        try:
+            audio = np.concatenate([part for path in self.paths
+                                    for part in (self.read(path), self.pad)])
+        except (OSError, ValueError, wave.Error) as e:
+            print(f"Could not read replay audio: {e}")
+            return False
+        self._thread = threading.Thread(target=self._run, args=(audio, callback), daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self, audio: np.ndarray, callback: BlockCallback):
+        block_seconds = self.blocksize / self.sample_rate / (self.speed or 1)
+        next_time = time.perf_counter()
+        while not self._stop.is_set():
+            for i in range(0, len(audio) - self.blocksize + 1, self.blocksize):
+                if self._stop.is_set():
+                    return
+                if self.speed:
+                    # Absolute deadlines, so pacing doesn't drift
+                    next_time += block_seconds
+                    delay = next_time - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                callback(audio[i:i + self.blocksize], None)
+            if not self.loop:
+                break
+        self.finished.set()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+
+class AudioCapture:
+    """
+    One always-open 16-bit audio input.
+    Every block is written to the ring buffer (so recordings can start from a
+    pre-roll point in the past) and passed to any registered listeners.
+    """
+
+    def __init__(self, sample_rate: int, ring_seconds: float):
+        self.sample_rate = sample_rate
+        self.ring = AudioRingBuffer(int(sample_rate * ring_seconds))
+
+        self.listeners: List[Callable[[np.ndarray], None]] = []
+        self.source: Optional[AudioSource] = None
+        
+        # Stream status flags reported by the audio callback
+        self.input_overflows = 0
+        self.status_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self.source is not None
+
+    def start(self, source: AudioSource) -> bool:
+        """Start receiving audio from the given source."""
+        if self.source is not None:
+            return True
+        if not source.start(self._on_block):
+            return False
+        self.source = source
+        return True
+
+    def _on_block(self, samples: np.ndarray, status):
+        if status:
+            # Counted rather than printed: printing from the audio thread under
+            # load only makes overflows worse
+            self.status_count += 1
+            if status.input_overflow:
+                self.input_overflows += 1
+
+        self.ring.write(samples)
+        for listener in self.listeners:
+            listener(samples)
+
+    def stats(self) -> Dict[str, int]:
+        return {"input_overflows": self.input_overflows, "status_flags": self.status_count}
+
+    def stop(self):
+        """Stop the audio source."""
+        if self.source is not None:
+            self.source.stop()
+            self.source = None
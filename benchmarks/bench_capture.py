@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Capture Path Microbenchmark
+Compares the old recording path (copy every block into a list, then
+concatenate, ravel and convert) with the preallocated ring buffer path
+(write in place, zero-copy level check, one conversion into a reusable
+float32 buffer).
+
+Usage:
+    python benchmarks/bench_capture.py [--seconds 10] [--runs 50]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audio_capture import AudioRingBuffer
+from config import SAMPLE_RATE, AUDIO_BLOCKSIZE, AUDIO_RING_SECONDS
+
+
+def make_blocks(seconds: float) -> list:
+    """Simulated (frames, 1) int16 blocks as delivered by sounddevice."""
+    rng = np.random.default_rng(0)
+    count = int(seconds * SAMPLE_RATE / AUDIO_BLOCKSIZE)
+    return [rng.integers(-3000, 3000, (AUDIO_BLOCKSIZE, 1), dtype=np.int16)
+            for _ in range(count)]
+
+
+def old_path(blocks: list) -> np.ndarray:
+    audio_data = []
+    for indata in blocks:
+        audio_data.append(indata.copy())
+        np.abs(indata).mean()
+    audio = np.concatenate(audio_data, axis=0)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    audio = audio.ravel()
+    return audio.astype(np.float32) / 32768.0
+
+
+def make_ring_path():
+    ring = AudioRingBuffer(int(SAMPLE_RATE * AUDIO_RING_SECONDS))
+    float_buffer = np.empty(ring.capacity, dtype=np.float32)
+    scratch = np.empty(AUDIO_BLOCKSIZE, dtype=np.int32)
+
+    def ring_path(blocks: list) -> np.ndarray:
+        start = ring.position
+        for indata in blocks:
+            cursor = ring.position
+            ring.write(indata[:, 0])
+            for part in ring.views(cursor):
+                np.abs(part, out=scratch[:len(part)], dtype=np.int32)
+                scratch[:len(part)].sum()
+        return ring.read_float(start, None, out=float_buffer)
+
+    return ring_path
+
+
+def measure(fn, blocks: list, runs: int):
+    """Return (mean ms per recording, peak traced bytes)."""
+    fn(blocks)  # Warm up
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(blocks)
+    elapsed = (time.perf_counter() - start) / runs * 1000
+
+    tracemalloc.start()
+    fn(blocks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    blocks = make_blocks(args.seconds)
+    print(f"{len(blocks)} blocks of {AUDIO_BLOCKSIZE} samples ({args.seconds:.0f} s of audio)")
+    for name, fn in [("list + concatenate", old_path), ("ring buffer", make_ring_path())]:
+        elapsed, peak = measure(fn, blocks, args.runs)
+        print(f"{name:<20} {elapsed:8.2f} ms per recording   "
+              f"peak allocations {peak / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Face Overlay Allocation Benchmark
+Animates every emotion headless, with the face frame cache off so every
+frame draws the overlays, and counts the surfaces FaceAnimator creates
+once warmed up (there should be none), then times the cheeks and
+thinking dots drawn the old way (new SRCALPHA surfaces every frame)
+against the pre-rendered sprites.
+
+Exits with status 1 if any surface is allocated after warm-up, so it can
+be run as a regression check.
+
+Usage:
+    python benchmarks/bench_face_allocations.py [--frames 1000]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame
+
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, BACKGROUND_COLOR
+from face import FaceAnimator, Emotion
+
+
+def draw_overlays_uncached(face: FaceAnimator, cx: int, cy: int, r: int):
+    """The cheeks and dots as drawn before the sprites were pre-rendered."""
+    cheek_radius = r // 8
+    for cheek_x in [cx - r // 2, cx + r // 2]:
+        s = pygame.Surface((cheek_radius * 2, cheek_radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(s, (*face.cheek_color, 100), (cheek_radius, cheek_radius), cheek_radius)
+        face.screen.blit(s, (cheek_x - cheek_radius, cy + r // 8 - cheek_radius))
+    for i in range(3):
+        phase = face.animation_time * 3 + i * 0.5
+        alpha = int(128 + 127 * math.sin(phase))
+        s = pygame.Surface((12, 12), pygame.SRCALPHA)
+        pygame.draw.circle(s, (150, 150, 255, alpha), (6, 6), 6)
+        face.screen.blit(s, (cx + (i - 1) * 20 - 6, cy - r - 36 - int(5 * math.sin(phase))))
+
+
+def draw_overlays_cached(face: FaceAnimator, cx: int, cy: int, r: int):
+    face._draw_cheeks(face.screen, cx, cy, r)
+    face._draw_thinking_dots(cx, cy, r)
+
+
+def measure(draw, face: FaceAnimator, frames: int) -> float:
+    """Mean microseconds per frame for both overlays."""
+    cx, cy, r = face.center_x, face.center_y, face.face_radius
+    start = time.perf_counter()
+    for i in range(frames):
+        face.animation_time = i / 30
+        draw(face, cx, cy, r)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=1000)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    face = FaceAnimator(screen)
+    face.sprite_paths = {}  # Always benchmark the procedural face
+    face.frame_cache.max_bytes = 0  # Draw the cheeks every frame; new poses would allocate
+    random.seed(0)
+
+    # Warm up: every overlay drawn at least once
+    for emotion in (Emotion.HAPPY, Emotion.THINKING):
+        face.set_emotion(emotion)
+        face.draw()
+    warm_up = face.surface_allocations
+
+    print(f"{args.frames} frames per emotion at {SCREEN_WIDTH}x{SCREEN_HEIGHT}\n")
+    print(f"Surfaces allocated during warm-up: {warm_up}")
+    leaks = 0
+    for emotion in Emotion:
+        face.set_emotion(emotion)
+        before = face.surface_allocations
+        for _ in range(args.frames):
+            face.update()
+            screen.fill(BACKGROUND_COLOR)
+            face.draw()
+        allocated = face.surface_allocations - before
+        leaks += allocated
+        print(f"  {emotion.name:<10} {allocated / args.frames:6.2f} surfaces/frame")
+
+    uncached = measure(draw_overlays_uncached, face, args.frames)
+    cached = measure(draw_overlays_cached, face, args.frames)
+    print(f"\nCheeks + dots, new surfaces  {uncached:7.1f} us/frame (5 surfaces/frame)")
+    print(f"Cheeks + dots, sprites       {cached:7.1f} us/frame")
+    pygame.quit()
+
+    if leaks:
+        print(f"\n⚠ {leaks} surfaces allocated after warm-up")
+        sys.exit(1)
+    print("\n✓ No surfaces allocated after warm-up")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Face Frame Cache Benchmark
+Animates the procedural face headless for each emotion, drawing every
+frame from scratch and from the frame cache, and reports the draw time per
+frame and the CPU time it costs per second of animation at 30 and 60 FPS.
+
+Usage:
+    python benchmarks/bench_face_cache.py [--frames 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame
+
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, BACKGROUND_COLOR
+from face import FaceAnimator, Emotion
+
+
+def measure(face: FaceAnimator, emotion: Emotion, frames: int) -> float:
+    """Mean milliseconds spent in draw() per frame."""
+    face.set_emotion(emotion)
+    random.seed(0)
+    spent = 0.0
+    for _ in range(frames):
+        face.update()
+        face.screen.fill(BACKGROUND_COLOR)
+        start = time.perf_counter()
+        face.draw()
+        spent += time.perf_counter() - start
+    return spent / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=1000)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    face = FaceAnimator(screen)
+    face.sprite_paths = {}  # Always benchmark the procedural face
+    cache_bytes = face.frame_cache.max_bytes
+
+    print(f"{args.frames} frames per emotion at {SCREEN_WIDTH}x{SCREEN_HEIGHT}\n")
+    print(f"{'emotion':<10} {'draw ms':>8} {'cached ms':>10} {'@30 FPS':>14} {'@60 FPS':>14}")
+    for emotion in Emotion:
+        face.frame_cache.max_bytes = 0
+        uncached = measure(face, emotion, args.frames)
+        face.frame_cache.max_bytes = cache_bytes
+        cached = measure(face, emotion, args.frames)
+        per_second = "  ".join(
+            f"{uncached * fps:5.1f}->{cached * fps:4.1f}" for fps in (30, 60)
+        )
+        print(f"{emotion.name:<10} {uncached:8.3f} {cached:10.3f}   {per_second}  ms/s")
+
+    cache = face.frame_cache
+    print(f"\nFrame cache: {len(cache)} frames, {cache.bytes / 1024 / 1024:.1f} of "
+          f"{cache.max_bytes / 1024 / 1024:.1f} MB, {cache.hits} hits, {cache.misses} misses")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+LLM HTTP Session Benchmark
+Measures per-request latency of a fresh connection per call (module-level
+requests.post) against LLMClient's pooled keep-alive session, using a local
+stand-in for the Ollama HTTP API so the model's generation time is excluded.
+
+Usage:
+    python benchmarks/bench_llm_session.py [--runs 200] [--connect-delay-ms 0]
+
+--connect-delay-ms adds a delay to every new connection on the server side,
+approximating the extra round trips of a TLS handshake to a remote API.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import llm
+
+CONNECT_DELAY = 0.0
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Minimal /api/tags and /api/chat endpoints with HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Otherwise delayed ACKs dominate keep-alive timings
+
+    def setup(self):
+        super().setup()
+        if CONNECT_DELAY:
+            time.sleep(CONNECT_DELAY)  # Once per new connection
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._send_json({"models": [{"name": llm.LLM_MODEL}]})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send_json({"message": {"role": "assistant", "content": "Hi!"}, "done": True})
+
+
+def time_requests(post, url: str, runs: int) -> list:
+    """Time `runs` chat requests made through `post`, in milliseconds."""
+    latencies = []
+    payload = {"model": llm.LLM_MODEL, "messages": [], "stream": False}
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = post(url, json=payload, timeout=5)
+        response.json()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list):
+    print(f"{name:<20} mean {statistics.mean(latencies):7.2f} ms   "
+          f"median {statistics.median(latencies):7.2f} ms   "
+          f"p95 {sorted(latencies)[int(len(latencies) * 0.95)]:7.2f} ms")
+
+
+def main():
+    global CONNECT_DELAY
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--connect-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    CONNECT_DELAY = args.connect_delay_ms / 1000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"http://127.0.0.1:{server.server_port}"
+
+    llm.LLM_BACKEND = "ollama"
+    llm.OLLAMA_HOST = host
+    client = llm.LLMClient()
+
+    url = f"{host}/api/chat"
+    fresh = time_requests(requests.post, url, args.runs)
+    pooled = time_requests(client.session.post, url, args.runs)
+
+    report("requests.post", fresh)
+    report("pooled session", pooled)
+    saving = statistics.mean(fresh) - statistics.mean(pooled)
+    print(f"Saving per request: {saving:.2f} ms")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Voice Pipeline Replay Benchmark
+Replays a WAV file through the full voice pipeline in place of the
+microphone (wake word, then recording with end-of-speech detection, then
+transcription) and reports when each stage finished and how much CPU the
+process used.
+
+The clip should contain the wake word followed by a command, e.g.
+"hey max, what time is it". Stage times are positions in the replayed
+audio when the stage finished.
+
+Usage:
+    python benchmarks/bench_pipeline.py clip.wav [--speed 1] [--wake-end 0.9] [--speech-end 2.6]
+
+--speed replays faster than real time (e.g. 4); if the wake word detector
+can't keep up, its queue drops blocks (reported below). Decoding still
+takes wall-clock time, so compare latencies and CPU use at --speed 1.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audio_capture import WavFileSource
+from config import SAMPLE_RATE, AUDIO_BLOCKSIZE
+from voice import VoiceRecognizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("wav", type=Path)
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed (1 = real time)")
+    parser.add_argument("--wake-end", type=float, help="labelled end of the wake phrase (s)")
+    parser.add_argument("--speech-end", type=float, help="labelled end of the command (s)")
+    args = parser.parse_args()
+
+    source = WavFileSource([args.wav], SAMPLE_RATE, AUDIO_BLOCKSIZE,
+                           speed=args.speed, pad_seconds=3.0)
+    voice = VoiceRecognizer(audio_source=source)
+    voice.warm_up_transcription()
+    voice.warm_up_wake_word()
+
+    woke = threading.Event()
+    marks = {}
+
+    def on_wake():
+        marks["wake"] = voice._capture.ring.position / SAMPLE_RATE
+        voice.wake_word_paused = True
+        woke.set()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    voice.start_wake_word_detection(callback=on_wake)
+    if voice._capture is None:
+        return
+
+    while not woke.wait(timeout=0.1):
+        if source.finished.is_set():
+            print("Wake word not detected")
+            voice.stop()
+            return
+
+    text = voice.listen_and_transcribe()
+    marks["transcript"] = voice._capture.ring.position / SAMPLE_RATE
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    voice.stop()
+
+    print()
+    print(f"Transcript: {text!r}")
+    wake_note = f" ({(marks['wake'] - args.wake_end) * 1000:+.0f} ms after phrase end)" if args.wake_end else ""
+    print(f"Wake word detected at   {marks['wake']:6.2f} s{wake_note}")
+    end_note = f" ({(marks['transcript'] - args.speech_end) * 1000:+.0f} ms after command end)" if args.speech_end else ""
+    print(f"Transcript ready at     {marks['transcript']:6.2f} s{end_note}")
+    if "final_latency_ms" in voice.metrics:
+        print(f"Final decode latency    {voice.metrics['final_latency_ms']:6.0f} ms")
+    print(f"CPU                     {cpu:6.2f} s over {wall:.2f} s wall ({cpu / wall:.0%} of one core)")
+    stats = voice.audio_stats()
+    print(f"Wake word queue         {stats['dropped_blocks']} dropped, "
+          f"high-water {stats['queue_high_water']}/{stats['queue_size']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Piper Synthesis Benchmark
+Compares per-utterance latency of a fresh piper process per reply against
+the persistent PiperWorker that keeps the voice model loaded.
+
+Usage:
+    python benchmarks/bench_piper_worker.py [--runs 10]
+
+Requires piper-tts and the configured voice (.onnx) under models/piper/.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import TTS_VOICE
+from piper_worker import PiperWorker
+from tts import TextToSpeech
+
+UTTERANCES = [
+    "Hello there! I'm Max, your friendly AI assistant.",
+    "It's currently three fifteen in the afternoon.",
+    "I'm having trouble thinking right now. Could you try again?",
+    "Why do programmers prefer dark mode? Because light attracts bugs!",
+]
+
+
+def time_calls(fn, runs: int) -> list:
+    """Call fn on each utterance `runs` times and return latencies in ms."""
+    latencies = []
+    for i in range(runs):
+        text = UTTERANCES[i % len(UTTERANCES)]
+        start = time.perf_counter()
+        fn(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list):
+    print(f"{name:<22} mean {statistics.mean(latencies):8.1f} ms   "
+          f"median {statistics.median(latencies):8.1f} ms   "
+          f"max {max(latencies):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    tts = TextToSpeech()
+    if not tts._piper_available:
+        print("piper CLI not available, skipping subprocess path")
+    else:
+        report("process per utterance",
+               time_calls(lambda text: b"".join(tts._stream_piper_cli(text)), args.runs))
+
+    worker = PiperWorker(TTS_VOICE)
+    start = time.perf_counter()
+    if not worker.start():
+        print("PiperWorker could not start, skipping persistent path")
+        return
+    print(f"{'worker model load':<22} {(time.perf_counter() - start) * 1000:8.1f} ms (once)")
+    report("persistent worker", time_calls(worker.synthesize, args.runs))
+    worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Face Rendering Benchmark
+Renders the main loop's frames headless for each assistant state, with a
+full repaint + flip every frame and with dirty-rect rendering, and reports
+the time per frame and the share of the screen pushed to the display.
+
+The dummy video driver doesn't copy anything to a real screen, so pushing
+pixels is emulated by blitting the updated areas into a second surface the
+size of the screen, as the Pi's framebuffer driver does.
+
+Usage:
+    python benchmarks/bench_render.py [--frames 600]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame
+
+import main as app
+from main import AssistantState
+
+
+def run(assistant, state: AssistantState, frames: int, dirty: bool, framebuffer) -> tuple:
+    """Return (ms per frame, fraction of the screen pushed per frame)."""
+    app.DIRTY_RECT_RENDERING = dirty
+    screen_area = assistant.screen.get_width() * assistant.screen.get_height()
+    pushed = 0
+
+    def update(rects=None):
+        nonlocal pushed
+        for rect in rects or [assistant.screen.get_rect()]:
+            framebuffer.blit(assistant.screen, rect, rect)
+            pushed += rect.width * rect.height
+
+    real_update, real_flip = pygame.display.update, pygame.display.flip
+    pygame.display.update, pygame.display.flip = update, update
+    try:
+        assistant.set_state(state)
+        assistant._full_redraw = True
+        random.seed(0)
+        start = time.perf_counter()
+        for _ in range(frames):
+            assistant.face.update()
+            assistant.render()
+        elapsed = (time.perf_counter() - start) / frames * 1000
+    finally:
+        pygame.display.update, pygame.display.flip = real_update, real_flip
+    return elapsed, pushed / frames / screen_area
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+
+    assistant = app.PiAssistant()
+    assistant._interactive = True
+    framebuffer = pygame.Surface(assistant.screen.get_size())
+
+    print(f"\n{args.frames} frames per state\n")
+    print(f"{'state':<10} {'full ms':>8} {'dirty ms':>9} {'pushed':>7}")
+    for state in AssistantState:
+        full, _ = run(assistant, state, args.frames, False, framebuffer)
+        dirty, share = run(assistant, state, args.frames, True, framebuffer)
+        print(f"{state.name:<10} {full:8.3f} {dirty:9.3f} {share:7.1%}")
+    assistant.cleanup()
+
+
+if __name__ == "__main__":
+    main()
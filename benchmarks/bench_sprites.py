@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Face Sprite Benchmark
+Loads face sprites the old way (PNG decode + scale, not converted) and
+through FaceAnimator (scaled pixels from the sprite cache, converted to
+the display format), and reports the load time per sprite and the time
+per frame to clear the screen and blit a sprite.
+
+Without --faces, sprites are generated: 512x512 RGBA PNGs in a temporary
+directory, like typical emoji artwork.
+
+Usage:
+    python benchmarks/bench_sprites.py [--faces assets/faces] [--frames 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame
+
+import face as face_module
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, BACKGROUND_COLOR
+from face import FaceAnimator, Emotion
+
+
+def make_sprites(faces_dir: Path):
+    """Write one 512x512 RGBA PNG per emotion."""
+    for i, emotion in enumerate(Emotion):
+        img = pygame.Surface((512, 512), pygame.SRCALPHA)
+        pygame.draw.circle(img, (255, 200 - i * 10, 80, 255), (256, 256), 250)
+        pygame.draw.circle(img, (40, 40, 40, 255), (180, 200), 40)
+        pygame.draw.circle(img, (40, 40, 40, 255), (332, 200), 40)
+        pygame.draw.ellipse(img, (40, 40, 40, 255), (176, 320, 160, 40 + i * 8))
+        pygame.draw.circle(img, (255, 150, 150, 100), (130, 300), 40)
+        pygame.image.save(img, str(faces_dir / f"{emotion.name.lower()}.png"))
+
+
+def load_old(face: FaceAnimator) -> dict:
+    """Sprites as loaded before: decoded and scaled, never converted."""
+    size = face.face_radius * 2
+    return {
+        emotion: pygame.transform.scale(pygame.image.load(str(path)), (size, size))
+        for emotion, path in face.sprite_paths.items()
+    }
+
+
+def load_new(face: FaceAnimator) -> dict:
+    face.sprites = {}
+    return {emotion: face._sprite(emotion) for emotion in list(face.sprite_paths)}
+
+
+def time_load(load, face: FaceAnimator) -> tuple:
+    """(sprites, ms per sprite)"""
+    start = time.perf_counter()
+    sprites = load(face)
+    return sprites, (time.perf_counter() - start) / len(sprites) * 1000
+
+
+def time_blits(face: FaceAnimator, sprites: dict, frames: int) -> float:
+    """Mean microseconds per frame blitting the sprites in turn."""
+    emotions = list(sprites)
+    start = time.perf_counter()
+    for i in range(frames):
+        face.screen.fill(BACKGROUND_COLOR)
+        face._draw_sprite(sprites[emotions[i % len(emotions)]])
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--faces", type=Path, help="directory of face sprites (default: generated)")
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        faces_dir = args.faces or Path(tmp) / "faces"
+        if args.faces is None:
+            faces_dir.mkdir()
+            make_sprites(faces_dir)
+        # Keep the benchmark's scaled sprites out of the real cache
+        face_module.FACES_DIR = faces_dir
+        face_module.SPRITE_CACHE_DIR = Path(tmp) / "sprite_cache"
+
+        face = FaceAnimator(screen)
+        if not face.sprite_paths:
+            print(f"No sprites found in {faces_dir}")
+            return
+        size = face.face_radius * 2
+        print(f"{len(face.sprite_paths)} sprites from {faces_dir}, scaled to {size}x{size}\n")
+
+        old, old_ms = time_load(load_old, face)
+        _, cold_ms = time_load(load_new, face)
+        new, warm_ms = time_load(load_new, face)
+        print(f"Load, PNG decode + scale      {old_ms:7.2f} ms/sprite")
+        print(f"Load, first run (fills cache) {cold_ms:7.2f} ms/sprite")
+        print(f"Load, from sprite cache       {warm_ms:7.2f} ms/sprite")
+
+        old_us = time_blits(face, old, args.frames)
+        new_us = time_blits(face, new, args.frames)
+        print(f"\nBlit, unconverted             {old_us:7.1f} us/frame")
+        print(f"Blit, display format          {new_us:7.1f} us/frame")
+        print(f"Saving                        {old_us - new_us:7.1f} us/frame, "
+              f"{(old_us - new_us) * 30 / 1000:.1f} ms per second at 30 FPS")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Status Bar Rendering Benchmark
+Renders the status bar headless many times, the old way (SysFont lookup
+and text rasterization every frame) and with the TextCache, and reports
+the time per frame. The state changes every 100 frames, as it would
+between turns.
+
+Usage:
+    python benchmarks/bench_status_bar.py [--frames 5000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame
+
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+from text_cache import TextCache
+
+STATES = [
+    ((100, 150, 255), "Listening for 'Hey Max'..."),
+    ((255, 100, 100), "Listening..."),
+    ((255, 200, 100), "Thinking..."),
+    ((100, 255, 150), None),
+]
+
+
+def draw_uncached(screen, color, text, cache):
+    pygame.draw.rect(screen, color, (0, SCREEN_HEIGHT - 10, SCREEN_WIDTH, 10))
+    if text:
+        font = pygame.font.SysFont(None, 32)
+        surface = font.render(text, True, color)
+        rect = surface.get_rect(centerx=SCREEN_WIDTH // 2, bottom=SCREEN_HEIGHT - 18)
+        screen.blit(surface, rect)
+
+
+def draw_cached(screen, color, text, cache):
+    pygame.draw.rect(screen, color, (0, SCREEN_HEIGHT - 10, SCREEN_WIDTH, 10))
+    if text:
+        surface = cache.render(text, 32, color)
+        rect = surface.get_rect(centerx=SCREEN_WIDTH // 2, bottom=SCREEN_HEIGHT - 18)
+        screen.blit(surface, rect)
+
+
+def measure(draw, screen, frames: int) -> float:
+    """Mean microseconds per frame."""
+    cache = TextCache()
+    start = time.perf_counter()
+    for i in range(frames):
+        color, text = STATES[(i // 100) % len(STATES)]
+        draw(screen, color, text, cache)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--frames", type=int, default=5000)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{args.frames} frames at {SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+    uncached = measure(draw_uncached, screen, args.frames)
+    cached = measure(draw_cached, screen, args.frames)
+    print(f"SysFont + render per frame  {uncached:8.1f} us/frame")
+    print(f"TextCache                   {cached:8.1f} us/frame")
+    print(f"Saving                      {uncached - cached:8.1f} us/frame "
+          f"({(uncached - cached) / uncached:.0%}), "
+          f"{(uncached - cached) * 30 / 1000:.1f} ms per second at 30 FPS")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
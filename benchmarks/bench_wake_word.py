@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Wake Word CPU Benchmark
+Measures how much CPU the always-on wake word loop needs, comparing the
+old open-vocabulary Vosk recognizer (final results on 0.5 s blocks), the
+grammar-restricted recognizer (wake phrase + [unk], partial results on
+the capture blocks) and the ONNX keyword spotter (MFCCs plus network).
+
+The keyword spotter is timed end to end through OnnxKeywordSpotter.process
+on quiet audio (the network is skipped) and on speech-level audio (the
+network runs on every block, the worst case). Without a model at
+--kws-model, an untrained network from wake_word_training.py is used; its
+cost is the same as a trained one's.
+
+CPU is reported as percent of one core while keeping up with real time:
+process CPU seconds spent / seconds of audio fed.
+
+Usage:
+    python benchmarks/bench_wake_word.py [--model models/vosk-model-small-en-us-0.15]
+                                         [--kws-model models/wake_word.onnx]
+                                         [--wav idle.wav] [--seconds 60]
+
+Without --wav, quiet room noise is generated (the idle case).
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import SAMPLE_RATE, AUDIO_BLOCKSIZE, WAKE_WORD, WAKE_WORD_MODEL
+
+
+def load_audio(path: Path, seconds: float) -> np.ndarray:
+    if path is None:
+        rng = np.random.default_rng(0)
+        return rng.normal(0, 60, int(seconds * SAMPLE_RATE)).astype(np.int16)
+    with wave.open(str(path), "rb") as w:
+        if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1 or w.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: expected {SAMPLE_RATE} Hz mono 16-bit")
+        return np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+
+
+def run(recognizer, audio: np.ndarray, blocksize: int, partial: bool) -> float:
+    """Feed audio block by block; return CPU percent of one core at real time."""
+    wake_word = WAKE_WORD.lower()
+    start = time.process_time()
+    for i in range(0, len(audio), blocksize):
+        data = audio[i:i + blocksize].tobytes()
+        if recognizer.AcceptWaveform(data):
+            text = json.loads(recognizer.Result()).get("text", "")
+        elif partial:
+            text = json.loads(recognizer.PartialResult()).get("partial", "")
+        else:
+            continue
+        if wake_word in text:
+            recognizer.Reset()
+    cpu = time.process_time() - start
+    return cpu / (len(audio) / SAMPLE_RATE) * 100
+
+
+def run_detector(detector, audio: np.ndarray) -> float:
+    """Feed capture blocks to a WakeWordDetector; return CPU percent of one core."""
+    detector.reset()
+    start = time.process_time()
+    for i in range(0, len(audio), AUDIO_BLOCKSIZE):
+        detector.process(audio[i:i + AUDIO_BLOCKSIZE])
+    cpu = time.process_time() - start
+    return cpu / (len(audio) / SAMPLE_RATE) * 100
+
+
+def bench_vosk(model_path: str, audio: np.ndarray):
+    try:
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+    except ImportError:
+        print("vosk is not installed (pip install vosk)")
+        return
+    SetLogLevel(-1)
+
+    model = Model(model_path)
+    grammar = json.dumps([WAKE_WORD.lower(), "[unk]"])
+    cases = [
+        ("open vocabulary, 0.5 s blocks", KaldiRecognizer(model, SAMPLE_RATE), 8000, False),
+        ("grammar, 0.5 s blocks", KaldiRecognizer(model, SAMPLE_RATE, grammar), 8000, False),
+        ("grammar + partials, capture blocks",
+         KaldiRecognizer(model, SAMPLE_RATE, grammar), AUDIO_BLOCKSIZE, True),
+    ]
+    for name, recognizer, blocksize, partial in cases:
+        print(f"{name:<36} {run(recognizer, audio, blocksize, partial):6.1f}% CPU")
+
+
+def bench_onnx(model_path: Path, audio: np.ndarray):
+    try:
+        from wake_word import OnnxKeywordSpotter
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        print("onnxruntime is not installed (pip install onnxruntime)")
+        return
+
+    if not model_path.exists():
+        from wake_word_training import init_params, export_onnx
+        model_path = Path(tempfile.mkdtemp()) / "untrained.onnx"
+        try:
+            export_onnx(init_params(hidden=32), model_path)
+        except ImportError:
+            print("No keyword-spotting model, and onnx is not installed to create one")
+            return
+        print("(untrained network: same cost as a trained one)")
+
+    # Gate at -50 dBFS: room noise stays below it, speech is well above it
+    detector = OnnxKeywordSpotter(str(model_path), WAKE_WORD, SAMPLE_RATE, threshold=1.1)
+    loud = np.random.default_rng(1).normal(0, 3000, len(audio)).astype(np.int16)
+    cases = [
+        ("keyword spotter, quiet (MFCC only)", audio),
+        ("keyword spotter, speech level", loud),
+    ]
+    for name, samples in cases:
+        cpu = run_detector(detector, samples)
+        print(f"{name:<36} {cpu:6.1f}% CPU ({detector.inferences} inferences)")
+        detector.inferences = 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="models/vosk-model-small-en-us-0.15")
+    parser.add_argument("--kws-model", type=Path, default=Path(WAKE_WORD_MODEL))
+    parser.add_argument("--wav", type=Path)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    args = parser.parse_args()
+
+    audio = load_audio(args.wav, args.seconds)
+    print(f"{len(audio) / SAMPLE_RATE:.0f} s of audio, wake word '{WAKE_WORD}'\n")
+    bench_vosk(args.model, audio)
+    bench_onnx(args.kws_model, audio)
+
+
+if __name__ == "__main__":
+    main()
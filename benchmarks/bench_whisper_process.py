@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Whisper In-Process vs Worker Process Benchmark
+Runs the face render loop (headless pygame) while transcribing a clip over
+and over, once with faster-whisper in a background thread of the same
+process and once in the WhisperWorker process, and reports frame times
+and transcription latency for both.
+
+Usage:
+    python benchmarks/bench_whisper_process.py [--wav clip.wav] [--seconds 10]
+
+Without --wav, 4 seconds of synthetic noise are transcribed.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame
+
+from config import SAMPLE_RATE, SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WHISPER_MODEL, BACKGROUND_COLOR
+from face import FaceAnimator, Emotion
+from whisper_worker import WhisperWorker
+
+OPTIONS = dict(language="en", beam_size=1, best_of=1, vad_filter=False)
+
+
+def load_audio(path: Path) -> np.ndarray:
+    if path is None:
+        return np.random.default_rng(0).normal(0, 0.05, 4 * SAMPLE_RATE).astype(np.float32)
+    with wave.open(str(path), "rb") as w:
+        if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1 or w.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: expected {SAMPLE_RATE} Hz mono 16-bit")
+        pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+    return pcm.astype(np.float32) / 32768.0
+
+
+def in_process_transcriber():
+    from faster_whisper import WhisperModel
+    model = WhisperModel(WHISPER_MODEL, device="cpu", compute_type="int8")
+
+    def transcribe(audio):
+        segments, _ = model.transcribe(audio, **OPTIONS)
+        return [s.text for s in segments]
+    return transcribe, lambda: None
+
+
+def worker_transcriber():
+    worker = WhisperWorker(WHISPER_MODEL, SAMPLE_RATE, max_seconds=30, compute_type="int8")
+    if not worker.start():
+        raise RuntimeError("worker did not start")
+    return (lambda audio: worker.transcribe(audio, **OPTIONS)), worker.stop
+
+
+def run(transcribe, audio: np.ndarray, seconds: float) -> dict:
+    """Render frames for `seconds` while transcribing in a loop in the background."""
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    face = FaceAnimator(screen)
+    face.set_emotion(Emotion.THINKING)
+    clock = pygame.time.Clock()
+
+    latencies = []
+    stop = threading.Event()
+
+    def transcribe_loop():
+        while not stop.is_set():
+            start = time.perf_counter()
+            transcribe(audio)
+            latencies.append(time.perf_counter() - start)
+
+    thread = threading.Thread(target=transcribe_loop, daemon=True)
+    thread.start()
+
+    frame_times = []
+    last = time.perf_counter()
+    end = last + seconds
+    while last < end:
+        pygame.event.pump()
+        face.update()
+        screen.fill(BACKGROUND_COLOR)
+        face.draw()
+        pygame.display.flip()
+        clock.tick(FPS)
+        now = time.perf_counter()
+        frame_times.append((now - last) * 1000)
+        last = now
+
+    stop.set()
+    thread.join()
+    return {"frames": frame_times, "latencies": latencies}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wav", type=Path)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    pygame.init()
+    audio = load_audio(args.wav)
+    budget = 1000 / FPS
+    print(f"{len(audio) / SAMPLE_RATE:.1f} s clip, model '{WHISPER_MODEL}', "
+          f"{FPS} FPS target ({budget:.1f} ms per frame)\n")
+    print(f"{'mode':<14} {'frame p50':>10} {'p95':>8} {'max':>8} {'late':>6} {'transcribe':>11}")
+
+    for name, factory in [("in-process", in_process_transcriber), ("worker", worker_transcriber)]:
+        try:
+            transcribe, close = factory()
+        except Exception as e:
+            print(f"{name:<14} unavailable: {e}")
+            continue
+        transcribe(audio)  # Warm up
+        result = run(transcribe, audio, args.seconds)
+        close()
+
+        frames = sorted(result["frames"])
+        late = sum(1 for t in frames if t > budget * 1.5) / len(frames)
+        latency = statistics.mean(result["latencies"]) * 1000 if result["latencies"] else float("nan")
+        print(f"{name:<14} {statistics.median(frames):8.1f}ms "
+              f"{frames[int(len(frames) * 0.95)]:6.1f}ms {frames[-1]:6.1f}ms "
+              f"{late:6.0%} {latency:9.0f}ms")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
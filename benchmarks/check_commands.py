@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Command Fast Path Check
+Feeds scripted Vosk results through CommandRecognizer.result() to check
+which utterances take the fast path. Uses a stand-in recognizer, so no
+Vosk model or audio is needed.
+
+Usage:
+    python benchmarks/check_commands.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from commands import CommandRecognizer
+
+
+class ScriptedRecognizer:
+    """Stands in for KaldiRecognizer, returning a fixed final result."""
+
+    def __init__(self, words):
+        self.words = words
+
+    def Reset(self):
+        pass
+
+    def FinalResult(self) -> str:
+        return json.dumps({
+            "text": " ".join(word for word, _ in self.words),
+            "result": [{"word": word, "conf": conf} for word, conf in self.words],
+        })
+
+
+# (words with confidences, expected command or None)
+CASES = [
+    ([("stop", 0.95)], "stop"),
+    ([("[unk]", 0.60), ("stop", 0.95)], "stop"),  # Wake word tail in the pre-roll
+    ([("[unk]", 0.40), ("[unk]", 0.50), ("volume", 0.90), ("up", 0.85)], "volume up"),
+    ([("stop", 0.95), ("[unk]", 0.70)], None),  # More was said after the command
+    ([("stop", 0.50)], None),  # Not confident enough
+    ([("[unk]", 0.90)], None),
+    ([], None),
+]
+
+
+def make(words) -> CommandRecognizer:
+    commands = CommandRecognizer.__new__(CommandRecognizer)
+    commands.commands = ["stop", "volume up"]
+    commands.min_confidence = 0.8
+    commands.recognizer = ScriptedRecognizer(words)
+    commands.reset()
+    return commands
+
+
+def main():
+    failures = 0
+    for words, expected in CASES:
+        got = make(words).result()
+        ok = got == expected
+        failures += not ok
+        heard = " ".join(word for word, _ in words) or "(silence)"
+        print(f"{'ok  ' if ok else 'FAIL'} {heard!r:<32} -> {got!r}")
+    print(f"\n{len(CASES) - failures}/{len(CASES)} passed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Offline VAD Evaluation
+Replays WAV fixtures through the recording endpointer and reports, per
+detector, how long after the true end of speech the recording stops
+(endpoint latency) and how often it stops while the user is still talking
+(false cuts).
+
+Fixtures are 16 kHz mono 16-bit WAV files in one directory, with a
+labels.json mapping each file name to {"speech_end": seconds}.
+
+Usage:
+    python benchmarks/eval_vad.py --synthesize benchmarks/fixtures/vad
+    python benchmarks/eval_vad.py --fixtures benchmarks/fixtures/vad [--backends energy,webrtc]
+
+--synthesize writes a reproducible set of speech-like fixtures (voiced
+syllables, fricatives and pauses over quiet and noisy backgrounds) for
+headless runs; recorded fixtures give more realistic numbers.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import (
+    SAMPLE_RATE, AUDIO_BLOCKSIZE,
+    VAD_HANGOVER_MS, VAD_THRESHOLD_DB, VAD_NO_SPEECH_TIMEOUT
+)
+from vad import VoiceActivityDetector, Endpointer, create_vad
+
+FALSE_CUT_TOLERANCE = 0.05  # Seconds before the labelled end still counted as on time
+
+
+class LegacyVAD(VoiceActivityDetector):
+    """The previous check: mean absolute amplitude of each block below 500."""
+
+    def __init__(self, sample_rate: int):
+        super().__init__(sample_rate)
+        self.frame_size = AUDIO_BLOCKSIZE
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        return np.abs(frame.astype(np.int32)).mean() >= 500
+
+
+def make_endpointer(backend: str) -> Endpointer:
+    if backend == "legacy":
+        return Endpointer(LegacyVAD(SAMPLE_RATE), SAMPLE_RATE, hangover_ms=1500,
+                          onset_ms=0, no_speech_timeout=VAD_NO_SPEECH_TIMEOUT)
+    vad = create_vad(backend, SAMPLE_RATE, threshold_db=VAD_THRESHOLD_DB)
+    return Endpointer(vad, SAMPLE_RATE, hangover_ms=VAD_HANGOVER_MS,
+                      no_speech_timeout=VAD_NO_SPEECH_TIMEOUT)
+
+
+def read_wav(path: Path) -> np.ndarray:
+    with wave.open(str(path), "rb") as w:
+        if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1 or w.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: expected {SAMPLE_RATE} Hz mono 16-bit")
+        return np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+
+
+def write_wav(path: Path, audio: np.ndarray):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(audio.astype(np.int16).tobytes())
+
+
+def endpoint_time(endpointer: Endpointer, audio: np.ndarray):
+    """Feed audio block by block; return seconds until the endpoint, or None."""
+    endpointer.reset()
+    for i in range(0, len(audio), AUDIO_BLOCKSIZE):
+        block = audio[i:i + AUDIO_BLOCKSIZE]
+        if endpointer.process(block):
+            return min(i + len(block), len(audio)) / SAMPLE_RATE
+    return None
+
+
+def evaluate(backend: str, fixtures: list) -> dict:
+    endpointer = make_endpointer(backend)
+    latencies, false_cuts, misses = [], 0, 0
+    for audio, speech_end in fixtures:
+        detected = endpoint_time(endpointer, audio)
+        if detected is None:
+            misses += 1
+        elif detected < speech_end - FALSE_CUT_TOLERANCE or not endpointer.speech_started:
+            false_cuts += 1
+        else:
+            latencies.append((detected - speech_end) * 1000)
+    return {"latencies": latencies, "false_cuts": false_cuts, "misses": misses}
+
+
+def synthesize(directory: Path, count: int = 24, seed: int = 0):
+    """Write synthetic speech-like fixtures plus labels.json."""
+    rng = np.random.default_rng(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    sr = SAMPLE_RATE
+    labels = {}
+
+    for n in range(count):
+        noisy = n % 2 == 1
+        parts = [np.zeros(int(rng.uniform(0.3, 0.8) * sr))]
+        for word in range(int(rng.integers(3, 9))):
+            for _ in range(int(rng.integers(1, 4))):
+                length = int(rng.uniform(0.12, 0.3) * sr)
+                t = np.arange(length) / sr
+                if rng.random() < 0.2:
+                    # Fricative: quiet noise band around 3 kHz (many zero crossings)
+                    band = np.convolve(rng.normal(0, 0.1, length), np.ones(4) / 4, mode="same")
+                    syllable = band * np.sin(2 * np.pi * 3000 * t)
+                else:
+                    f0 = rng.uniform(100, 220)
+                    syllable = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+                    syllable *= 0.1 * np.sin(np.pi * t / t[-1])  # Syllable envelope
+                parts.append(syllable)
+                parts.append(np.zeros(int(rng.uniform(0.02, 0.08) * sr)))
+            # Pause between words (must not end the recording)
+            parts.append(np.zeros(int(rng.uniform(0.08, 0.2) * sr)))
+        parts.pop()
+        parts.pop()
+        speech_end = sum(len(p) for p in parts) / sr
+        parts.append(np.zeros(int(2.5 * sr)))
+
+        signal = np.concatenate(parts)
+        noise_level = 0.02 if noisy else 0.001  # Fan/street noise vs quiet room
+        signal = signal + rng.normal(0, noise_level, len(signal))
+        name = f"synthetic_{n:02d}_{'noisy' if noisy else 'quiet'}.wav"
+        write_wav(directory / name, np.clip(signal * 32768, -32768, 32767))
+        labels[name] = {"speech_end": round(speech_end, 3)}
+
+    (directory / "labels.json").write_text(json.dumps(labels, indent=2))
+    print(f"Wrote {count} fixtures to {directory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=Path("benchmarks/fixtures/vad"))
+    parser.add_argument("--backends", default="legacy,energy,webrtc,silero")
+    parser.add_argument("--synthesize", type=Path, metavar="DIR",
+                        help="write synthetic fixtures to DIR and exit")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize(args.synthesize)
+        return
+
+    labels_path = args.fixtures / "labels.json"
+    if not labels_path.exists():
+        print(f"No labels.json in {args.fixtures} (create fixtures with --synthesize)")
+        return
+    labels = json.loads(labels_path.read_text())
+    fixtures = [(read_wav(args.fixtures / name), label["speech_end"])
+                for name, label in sorted(labels.items())]
+    print(f"{len(fixtures)} fixtures, hangover {VAD_HANGOVER_MS} ms\n")
+
+    print(f"{'backend':<8} {'median':>9} {'mean':>9} {'p90':>9} {'false cuts':>11} {'missed':>7}")
+    for backend in args.backends.split(","):
+        result = evaluate(backend, fixtures)
+        latencies = sorted(result["latencies"]) or [float("nan")]
+        print(f"{backend:<8} "
+              f"{statistics.median(latencies):7.0f}ms "
+              f"{statistics.mean(latencies):7.0f}ms "
+              f"{latencies[int(len(latencies) * 0.9)]:7.0f}ms "
+              f"{result['false_cuts'] / len(fixtures):10.0%} "
+              f"{result['misses'] / len(fixtures):6.0%}")
+
+
+if __name__ == "__main__":
+    main()
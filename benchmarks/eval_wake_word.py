@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Offline Wake Word Evaluation
+Replays WAV fixtures through the wake word backends and reports detection
+latency (time from the end of the wake phrase to the detection), missed
+detections, false triggers and CPU use (percent of one core at real time).
+
+Fixtures are 16 kHz mono 16-bit WAV files in one directory, with a
+labels.json mapping each file name to {"wake_end": seconds}, or to
+{"wake_end": null} for clips without the wake word. Record them with e.g.
+    arecord -f S16_LE -r 16000 -c 1 hey_max_01.wav
+and label where "hey max" ends. Clips where a command follows the wake
+phrase without a pause show the difference between the modes best.
+
+Usage:
+    python benchmarks/eval_wake_word.py --fixtures benchmarks/fixtures/wake
+                                        [--backends vosk,onnx]
+                                        [--model models/vosk-model-small-en-us-0.15]
+                                        [--kws-model models/wake_word.onnx]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import (
+    SAMPLE_RATE, AUDIO_BLOCKSIZE,
+    WAKE_WORD, WAKE_WORD_SENSITIVITY, WAKE_WORD_MODEL, WAKE_WORD_COOLDOWN
+)
+from wake_word import VoskWakeWord, OnnxKeywordSpotter
+
+
+def read_wav(path: Path) -> np.ndarray:
+    with wave.open(str(path), "rb") as w:
+        if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1 or w.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: expected {SAMPLE_RATE} Hz mono 16-bit")
+        return np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+
+
+def first_detection(detector, audio: np.ndarray, blocksize: int):
+    """Feed audio block by block; return seconds at the first detection, or None."""
+    detector.reset()
+    # Trailing silence lets end-of-utterance results arrive in final-only mode
+    audio = np.concatenate((audio, np.zeros(SAMPLE_RATE, dtype=np.int16)))
+    for i in range(0, len(audio), blocksize):
+        block = audio[i:i + blocksize]
+        if detector.process(block) is not None:
+            return (i + len(block)) / SAMPLE_RATE
+    return None
+
+
+def evaluate(detector, fixtures: list, blocksize: int) -> dict:
+    latencies, misses, false_triggers, positives = [], 0, 0, 0
+    cpu_start = time.process_time()
+    for audio, wake_end in fixtures:
+        detected = first_detection(detector, audio, blocksize)
+        if wake_end is None:
+            false_triggers += detected is not None
+            continue
+        positives += 1
+        if detected is None:
+            misses += 1
+        else:
+            latencies.append((detected - wake_end) * 1000)
+    # Each clip is fed with one second of trailing silence
+    audio_seconds = sum(len(audio) for audio, _ in fixtures) / SAMPLE_RATE + len(fixtures)
+    cpu = (time.process_time() - cpu_start) / audio_seconds * 100
+    return {"latencies": latencies, "misses": misses, "positives": positives,
+            "false_triggers": false_triggers, "negatives": len(fixtures) - positives,
+            "cpu": cpu}
+
+
+def print_results(name: str, result: dict):
+    latencies = sorted(result["latencies"]) or [float("nan")]
+    print(f"{name:<28} "
+          f"{statistics.median(latencies):7.0f}ms "
+          f"{latencies[int(len(latencies) * 0.9)]:7.0f}ms "
+          f"{result['misses']:>3}/{result['positives']:<3} missed "
+          f"{result['false_triggers']:>3}/{result['negatives']:<3} false "
+          f"{result['cpu']:6.1f}% CPU")
+
+
+def evaluate_vosk(model_path: str, fixtures: list):
+    try:
+        from vosk import Model, KaldiRecognizer, SetLogLevel
+    except ImportError:
+        print("vosk is not installed (pip install vosk)")
+        return
+    SetLogLevel(-1)
+    model = Model(model_path)
+    grammar = json.dumps([WAKE_WORD.lower(), "[unk]"])
+
+    def vosk_detector(use_partials: bool) -> VoskWakeWord:
+        return VoskWakeWord(KaldiRecognizer(model, SAMPLE_RATE, grammar), WAKE_WORD,
+                            SAMPLE_RATE, use_partials=use_partials, cooldown=WAKE_WORD_COOLDOWN)
+
+    print_results("vosk, final, 500 ms blocks", evaluate(vosk_detector(False), fixtures, 8000))
+    print_results(f"vosk, partials, {AUDIO_BLOCKSIZE * 1000 // SAMPLE_RATE} ms blocks",
+                  evaluate(vosk_detector(True), fixtures, AUDIO_BLOCKSIZE))
+
+
+def evaluate_onnx(model_path: str, fixtures: list):
+    try:
+        detector = OnnxKeywordSpotter(model_path, WAKE_WORD, SAMPLE_RATE,
+                                      threshold=1.0 - WAKE_WORD_SENSITIVITY,
+                                      cooldown=WAKE_WORD_COOLDOWN)
+    except ImportError:
+        print("onnxruntime is not installed (pip install onnxruntime)")
+        return
+    except Exception as e:
+        print(f"Could not load keyword spotter: {e}")
+        return
+    result = evaluate(detector, fixtures, AUDIO_BLOCKSIZE)
+    print_results(f"onnx, {AUDIO_BLOCKSIZE * 1000 // SAMPLE_RATE} ms blocks", result)
+    print(f"{'':<28} {detector.inferences} network runs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=Path("benchmarks/fixtures/wake"))
+    parser.add_argument("--backends", default="vosk,onnx")
+    parser.add_argument("--model", default="models/vosk-model-small-en-us-0.15")
+    parser.add_argument("--kws-model", default=WAKE_WORD_MODEL)
+    args = parser.parse_args()
+
+    labels_path = args.fixtures / "labels.json"
+    if not labels_path.exists():
+        print(f"No labels.json in {args.fixtures}")
+        return
+    labels = json.loads(labels_path.read_text())
+    fixtures = [(read_wav(args.fixtures / name), label["wake_end"])
+                for name, label in sorted(labels.items())]
+
+    print(f"{len(fixtures)} fixtures, wake word '{WAKE_WORD}'\n")
+    print(f"{'mode':<28} {'median':>9} {'p90':>9}")
+    for backend in args.backends.split(","):
+        if backend == "vosk":
+            evaluate_vosk(args.model, fixtures)
+        elif backend == "onnx":
+            evaluate_onnx(args.kws_model, fixtures)
+
+
+if __name__ == "__main__":
+    main()
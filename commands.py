@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Command Fast Path
+Recognizes a small set of short commands with a grammar-restricted Vosk
+recognizer while the user is speaking, so those utterances don't need a
+full Whisper decode.
+"""
+
+import json
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+
+class CommandRecognizer:
+    """
+    Vosk recognizer restricted to the registered command phrases (plus
+    [unk] for anything else). Audio is fed during recording; result()
+    returns the command only if the whole utterance matched one phrase with
+    every word at or above `min_confidence`.
+    """
+
+    def __init__(self, model, sample_rate: int, commands: List[str],
+                 min_confidence: float = 0.8):
+        from vosk import KaldiRecognizer
+        self.commands = [command.lower() for command in commands]
+        self.min_confidence = min_confidence
+        self.recognizer = KaldiRecognizer(
+            model, sample_rate, json.dumps(self.commands + ["[unk]"])
+        )
+        self.recognizer.SetWords(True)  # Per-word confidences in results
+        self._words: List[Tuple[str, float]] = []  # (word, confidence)
+
+        # Fast path statistics
+        self.utterances = 0
+        self.hits = 0
+        self.hit_ms = 0.0    # Total time to a result on hits
+        self.miss_ms = 0.0   # Total Whisper time on misses
+
+    def reset(self):
+        self.recognizer.Reset()
+        self._words = []
+
+    def accept(self, samples: np.ndarray):
+        """Feed 16-bit mono audio."""
+        if self.recognizer.AcceptWaveform(samples.tobytes()):
+            self._collect(self.recognizer.Result())
+
+    def _collect(self, result_json: str):
+        result = json.loads(result_json)
+        if result.get("result"):
+            self._words.extend((word["word"], word.get("conf", 0.0)) for word in result["result"])
+        elif result.get("text"):
+            self._words.extend((word, 0.0) for word in result["text"].split())
+
+    def result(self) -> Optional[str]:
+        """The matched command, or None if the utterance needs full transcription."""
+        self._collect(self.recognizer.FinalResult())
+
+        # Leading [unk] is noise before the command (e.g. the tail of the
+        # wake word); anything unrecognized after it means more was said
+        words = self._words
+        while words and words[0][0] == "[unk]":
+            words = words[1:]
+
+        text = " ".join(word for word, _ in words)
+        if text not in self.commands:
+            return None
+        if min(conf for _, conf in words) < self.min_confidence:
+            return None
+        return text
+
+    def record(self, hit: bool, ms: float):
+        self.utterances += 1
+        if hit:
+            self.hits += 1
+            self.hit_ms += ms
+        else:
+            self.miss_ms += ms
+
+    def stats(self) -> Dict[str, float]:
+        misses = self.utterances - self.hits
+        return {
+            "utterances": self.utterances,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.utterances if self.utterances else 0.0,
+            "hit_ms": self.hit_ms / self.hits if self.hits else 0.0,
+            "whisper_ms": self.miss_ms / misses if misses else 0.0,
+        }
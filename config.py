@@ -14,6 +14,9 @@ SCREEN_WIDTH = 800   # Adjust for your 5" screen
 SCREEN_HEIGHT = 480  # Common 5" resolution
 FULLSCREEN = False   # Set True on Pi for kiosk mode
 FPS = 30
+DIRTY_RECT_RENDERING = True  # Repaint only what changed; set False if the display needs full flips
+FACE_FRAME_CACHE_MB = 16     # Memory for pre-rendered face poses (0 = draw shapes every frame)
+SPRITE_CACHE_DIR = BASE_DIR / "cache" / "sprites"  # Face sprites scaled to the face size
 
 # === COLORS ===
 BACKGROUND_COLOR = (20, 20, 30)      # Dark background
@@ -43,20 +46,67 @@ Be warm, slightly playful, and helpful."""
 # === WAKE WORD SETTINGS ===
 WAKE_WORD = "hey max"  # Can also use "computer", "assistant", etc.
 WAKE_WORD_SENSITIVITY = 0.5  # 0.0 to 1.0
+WAKE_WORD_BACKEND = "vosk"  # "vosk" or "onnx" (small keyword-spotting model, needs onnxruntime)
+WAKE_WORD_MODEL = "models/wake_word.onnx"  # Keyword-spotting model for the "onnx" backend
+WAKE_WORD_GRAMMAR = True  # Restrict Vosk to the wake phrase (far cheaper than open vocabulary)
+WAKE_WORD_PARTIALS = True  # Fire on partial results instead of waiting for the end of the utterance
+WAKE_WORD_COOLDOWN = 1.0  # Seconds after a detection during which audio is ignored
+WAKE_WORD_QUEUE_BLOCKS = 10  # Audio blocks queued for the detector; older ones are dropped when it falls behind
 
 # === AUDIO SETTINGS ===
 SAMPLE_RATE = 16000
 AUDIO_CHANNELS = 1
+AUDIO_BLOCKSIZE = 1600      # Samples per microphone block (100 ms)
+AUDIO_RING_SECONDS = 15     # Recent audio kept in memory (>= max recording + pre-roll)
+RECORDING_PREROLL = 0.5     # Seconds of audio before activation included in recordings
+AUDIO_REPLAY_FILES = []     # WAV files (16 kHz mono) replayed instead of the microphone, for headless testing
+AUDIO_REPLAY_SPEED = 1.0    # Replay pace: 1 = like a live microphone, 0 = as fast as possible
+
+# === VOICE ACTIVITY DETECTION ===
+# Decides when the user has finished speaking
+VAD_BACKEND = "energy"        # "energy", "webrtc" (pip install webrtcvad) or "silero" (models/silero_vad.onnx)
+VAD_HANGOVER_MS = 400         # Non-speech after speech before recording stops
+VAD_THRESHOLD_DB = 9.0        # Level above the adaptive noise floor counted as speech (energy backend)
+VAD_NO_SPEECH_TIMEOUT = 3.0   # Give up if no speech starts within this many seconds
 
 # === SPEECH RECOGNITION ===
 # Whisper model sizes: tiny, base, small, medium, large
 # For Pi 4: use "tiny" or "base"
 WHISPER_MODEL = "tiny"
+WHISPER_PROCESS = False  # Run Whisper in its own process so transcription doesn't stutter the face
+# Tuned model/compute type/threads/beam for this machine, written by
+# `python whisper_tuning.py` (WHISPER_MODEL and int8 are used without it)
+WHISPER_PROFILE = BASE_DIR / "whisper_profile.json"
+WHISPER_TARGET_RTF = 0.5  # Calibration target: decoding seconds per second of audio
+
+# Short commands recognized by a small Vosk grammar while recording;
+# a confident match skips Whisper entirely
+COMMAND_FAST_PATH = True
+FAST_PATH_COMMANDS = ["stop", "cancel", "never mind", "louder", "quieter", "what time is it"]
+FAST_PATH_MIN_CONFIDENCE = 0.8  # Every word must be at least this confident
+
+# Transcribe while the user is still speaking, so only the last short
+# segment is left to decode when they stop
+STREAMING_TRANSCRIPTION = True
+STREAMING_CHUNK_SECONDS = 2.0   # Audio gathered before the first decoding pass
+STREAMING_TAIL_SECONDS = 1.0    # Most recent audio left uncommitted and re-decoded
 
 # === TEXT-TO-SPEECH ===
 # Piper voice (will be downloaded on first run)
 TTS_VOICE = "en_US-lessac-medium"
 TTS_SPEED = 1.0
+TTS_SAMPLE_RATE = 22050  # Output rate of Piper "medium" voices
+TTS_STREAM_AUDIO = True  # Stream Piper audio straight to sounddevice (no aplay/temp files)
+
+# Cache synthesized audio so repeated phrases play without running Piper
+TTS_CACHE_ENABLED = True
+TTS_CACHE_DIR = BASE_DIR / "cache" / "tts"
+TTS_CACHE_MAX_MB = 50
+
+# === STARTUP ===
+# Load Whisper, Vosk and the TTS voice in the background at startup (with a
+# dummy inference each) so the first turn is as fast as later ones
+WARM_UP_ON_START = True
 
 # === TOUCH SETTINGS ===
 TOUCH_ENABLED = True
@@ -6,12 +6,14 @@ Displays animated emoji faces that react to assistant state.
 
 import pygame
 import math
+import os
 import random
 from enum import Enum, auto
-from typing import Tuple, Optional
+from collections import OrderedDict
+from typing import Dict, Tuple, Optional, List
 from pathlib import Path
 
-from config import SCREEN_WIDTH, SCREEN_HEIGHT, FACES_DIR
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, FACES_DIR, FACE_FRAME_CACHE_MB, SPRITE_CACHE_DIR
 
 
 class Emotion(Enum):
@@ -25,6 +27,43 @@ class Emotion(Enum):
     CONFUSED = auto()
 
 
+MOUTH_LEVELS = 12  # Distinct mouth openings (each one is a cached frame)
+FRAME_COLORKEY = (255, 0, 255)  # Transparent corners of cached face frames
+DOT_ALPHA_LEVELS = 32  # Pre-rendered opacities of a thinking dot
+
+
+class FrameCache:
+    """Rendered face frames by pose, least recently used evicted beyond max_bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[pygame.Surface]:
+        frame = self._frames.get(key)
+        if frame is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._frames.move_to_end(key)
+        return frame
+
+    def put(self, key: tuple, frame: pygame.Surface):
+        if self.max_bytes <= 0:
+            return
+        self._frames[key] = frame
+        self.bytes += frame.get_pitch() * frame.get_height()
+        while self.bytes > self.max_bytes and len(self._frames) > 1:
+            _, old = self._frames.popitem(last=False)
+            self.bytes -= old.get_pitch() * old.get_height()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
 class FaceAnimator:
     """
     Animated face display using procedural graphics.
@@ -56,8 +95,23 @@ class FaceAnimator:
         # Bounce animation
         self.bounce_offset = 0
         
-        # Try to load sprite faces if available
-        self.sprites = self._load_sprites()
+        # What was on screen after the last dirty_rects() call:
+        # (emotion, bounce, blinking, mouth height)
+        self._drawn_pose: Optional[tuple] = None
+        
+        # Pre-rendered procedural face poses
+        self.frame_cache = FrameCache(int(FACE_FRAME_CACHE_MB * 1024 * 1024))
+        
+        # Overlay sprites, built on first use
+        self._cheek_sprite: Optional[pygame.Surface] = None
+        self._dot_sprites: List[pygame.Surface] = []
+        
+        # Surfaces created by the animator (steady after warm-up)
+        self.surface_allocations = 0
+        
+        # Sprite faces if available, each loaded the first time it is shown
+        self.sprite_paths = self._find_sprites()
+        self.sprites: Dict[Emotion, pygame.Surface] = {}
         
         # Colors
         self.face_color = (255, 220, 100)  # Yellow face
@@ -65,21 +119,62 @@ class FaceAnimator:
         self.mouth_color = (40, 40, 40)     # Dark mouth
         self.cheek_color = (255, 150, 150)  # Pink cheeks
         
-    def _load_sprites(self) -> dict:
-        """Try to load face sprite images."""
-        sprites = {}
+    def _find_sprites(self) -> Dict[Emotion, Path]:
+        """Face sprite images that exist (not loaded yet)."""
+        paths = {}
         if FACES_DIR.exists():
             for emotion in Emotion:
                 sprite_path = FACES_DIR / f"{emotion.name.lower()}.png"
                 if sprite_path.exists():
-                    try:
-                        img = pygame.image.load(str(sprite_path))
-                        # Scale to fit face area
-                        size = self.face_radius * 2
-                        sprites[emotion] = pygame.transform.scale(img, (size, size))
-                    except pygame.error:
-                        pass
-        return sprites
+                    paths[emotion] = sprite_path
+        return paths
+        
+    def _sprite(self, emotion: Emotion) -> Optional[pygame.Surface]:
+        """The sprite for an emotion, loaded and converted on first use."""
+        sprite = self.sprites.get(emotion)
+        if sprite is not None:
+            return sprite
+            
+        try:
+            sprite = self._load_sprite(self.sprite_paths[emotion])
+        except (pygame.error, ValueError):
+            # Unreadable image: draw this emotion procedurally from now on
+            del self.sprite_paths[emotion]
+            self._drawn_pose = None
+            return None
+            
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()  # Display pixel format: no conversion when blitted
+        self.sprites[emotion] = sprite
+        return sprite
+        
+    def _load_sprite(self, sprite_path: Path) -> pygame.Surface:
+        """
+        Load a sprite scaled to fit the face area. Scaled pixels are kept in
+        SPRITE_CACHE_DIR per size, so later starts skip the PNG decode and scale.
+        """
+        size = self.face_radius * 2
+        cache_path = SPRITE_CACHE_DIR / f"{sprite_path.stem}_{size}.rgba"
+        try:
+            if cache_path.stat().st_mtime >= sprite_path.stat().st_mtime:
+                data = cache_path.read_bytes()
+                if len(data) == size * size * 4:
+                    return pygame.image.frombytes(data, (size, size), "RGBA")
+                # Truncated or corrupt: drop it and rebuild from the PNG
+                cache_path.unlink()
+        except (OSError, ValueError, pygame.error):
+            pass
+            
+        img = pygame.image.load(str(sprite_path))
+        sprite = pygame.transform.scale(img, (size, size))
+        try:
+            SPRITE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_bytes(pygame.image.tobytes(sprite, "RGBA"))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠ Sprite cache write error: {e}")
+        return sprite
         
     def set_emotion(self, emotion: Emotion):
         """Set the current face emotion."""
@@ -121,46 +216,142 @@ class FaceAnimator:
         # Bounce animation
         self.bounce_offset = 3 * math.sin(self.animation_time * 2)
         
+    def _pose(self) -> tuple:
+        """The parts of the animation state that decide what the face looks like."""
+        return (self.emotion, int(self.bounce_offset), self.is_blinking, self._mouth_height())
+        
+    def _mouth_height(self) -> Optional[int]:
+        """Height of the open mouth, quantized to MOUTH_LEVELS steps; None when closed."""
+        if self.emotion == Emotion.SPEAKING or self.mouth_open > 0.1:
+            level = round(self.mouth_open * MOUTH_LEVELS) / MOUTH_LEVELS
+            return int(self.face_radius // 4 * level)
+        return None
+        
+    def _face_area(self, emotion: Emotion, bounce: int) -> pygame.Rect:
+        """Everything the face can cover at a given bounce offset."""
+        r = self.face_radius + 2  # Outline
+        cy = self.center_y + bounce
+        rect = pygame.Rect(self.center_x - r, cy - r, r * 2, r * 2)
+        if emotion == Emotion.THINKING and emotion not in self.sprite_paths:
+            rect.union_ip(self._dots_rect(cy))
+        return rect
+        
+    def _eyes_rect(self, cy: int) -> pygame.Rect:
+        r = self.face_radius
+        eye_radius = r // 6 + 2
+        half_span = r // 4 + eye_radius
+        return pygame.Rect(self.center_x - half_span, cy - r // 4 - eye_radius,
+                           half_span * 2, eye_radius * 2)
+        
+    def _mouth_rect(self, cy: int) -> pygame.Rect:
+        r = self.face_radius
+        half_width = r // 2 + 2
+        return pygame.Rect(self.center_x - half_width, cy + r // 3 - r // 4 - 2,
+                           half_width * 2, r // 2 + 4)
+        
+    def _dots_rect(self, cy: int) -> pygame.Rect:
+        dot_y = cy - self.face_radius - 30
+        return pygame.Rect(self.center_x - 26, dot_y - 11, 52, 22)
+        
+    def dirty_rects(self) -> List[pygame.Rect]:
+        """
+        Screen areas that change when the face is drawn in its current state,
+        compared with the previous call: the whole face when it moved or
+        changed emotion, otherwise just the eyes, mouth or thinking dots.
+        """
+        pose = self._pose()
+        previous = self._drawn_pose
+        self._drawn_pose = pose
+        emotion, bounce, blinking, mouth = pose
+        cy = self.center_y + bounce
+        
+        if previous is None or previous[:2] != pose[:2]:
+            rects = [self._face_area(emotion, bounce)]
+            if previous is not None:
+                rects.append(self._face_area(*previous[:2]))
+            return rects
+        
+        if emotion in self.sprite_paths:
+            return []
+        rects = []
+        if blinking != previous[2]:
+            rects.append(self._eyes_rect(cy))
+        if mouth != previous[3]:
+            rects.append(self._mouth_rect(cy))
+        if emotion == Emotion.THINKING:
+            rects.append(self._dots_rect(cy))  # Animated every frame
+        return rects
+        
     def draw(self):
         """Draw the animated face."""
         # Check for sprite first
-        if self.emotion in self.sprites:
-            self._draw_sprite()
+        sprite = self._sprite(self.emotion) if self.emotion in self.sprite_paths else None
+        if sprite is not None:
+            self._draw_sprite(sprite)
         else:
             self._draw_procedural()
             
-    def _draw_sprite(self):
+    def _draw_sprite(self, sprite: pygame.Surface):
         """Draw face using sprite image."""
-        sprite = self.sprites[self.emotion]
         x = self.center_x - sprite.get_width() // 2
         y = self.center_y - sprite.get_height() // 2 + int(self.bounce_offset)
         self.screen.blit(sprite, (x, y))
         
     def _draw_procedural(self):
-        """Draw face using procedural shapes."""
+        """Draw face using procedural shapes (each distinct pose rendered once)."""
         cx = self.center_x
         cy = self.center_y + int(self.bounce_offset)
         r = self.face_radius
         
+        if self.frame_cache.max_bytes > 0:
+            key = (self.emotion, self.is_blinking, self._mouth_height())
+            frame = self.frame_cache.get(key)
+            if frame is None:
+                frame = self._render_face(r)
+                self.frame_cache.put(key, frame)
+            self.screen.blit(frame, (cx - frame.get_width() // 2, cy - frame.get_height() // 2))
+        else:
+            self._draw_face(self.screen, cx, cy, r)
+            
+        # Draw thinking indicators (animated every frame, not part of the pose)
+        if self.emotion == Emotion.THINKING:
+            self._draw_thinking_dots(cx, cy, r)
+            
+    def _render_face(self, r: int) -> pygame.Surface:
+        """Rasterize the face in its current pose onto its own surface."""
+        size = r * 2 + 6
+        surface = self._new_surface((size, size))
+        surface.fill(FRAME_COLORKEY)
+        self._draw_face(surface, size // 2, size // 2, r)
+        surface.set_colorkey(FRAME_COLORKEY, pygame.RLEACCEL)
+        return surface
+            
+    def _new_surface(self, size: Tuple[int, int], alpha: bool = False) -> pygame.Surface:
+        """Create a surface in the display pixel format, counting the allocation."""
+        self.surface_allocations += 1
+        surface = pygame.Surface(size, pygame.SRCALPHA if alpha else 0)
+        if pygame.display.get_surface() is not None:
+            # Display pixel format: no conversion when blitted
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        return surface
+        
+    def _draw_face(self, surface: pygame.Surface, cx: int, cy: int, r: int):
+        """Draw the face circle and features (everything but the thinking dots)."""
         # Main face circle
-        pygame.draw.circle(self.screen, self.face_color, (cx, cy), r)
-        pygame.draw.circle(self.screen, (200, 170, 80), (cx, cy), r, 3)  # Outline
+        pygame.draw.circle(surface, self.face_color, (cx, cy), r)
+        pygame.draw.circle(surface, (200, 170, 80), (cx, cy), r, 3)  # Outline
         
         # Draw eyes
-        self._draw_eyes(cx, cy, r)
+        self._draw_eyes(surface, cx, cy, r)
         
         # Draw mouth
-        self._draw_mouth(cx, cy, r)
+        self._draw_mouth(surface, cx, cy, r)
         
         # Draw cheeks for happy emotion
         if self.emotion in [Emotion.HAPPY, Emotion.SPEAKING]:
-            self._draw_cheeks(cx, cy, r)
-            
-        # Draw thinking indicators
-        if self.emotion == Emotion.THINKING:
-            self._draw_thinking_dots(cx, cy, r)
+            self._draw_cheeks(surface, cx, cy, r)
             
-    def _draw_eyes(self, cx: int, cy: int, r: int):
+    def _draw_eyes(self, surface: pygame.Surface, cx: int, cy: int, r: int):
         """Draw the eyes."""
         eye_y = cy - r // 4
         eye_spacing = r // 2
@@ -170,19 +361,19 @@ class FaceAnimator:
             if self.is_blinking:
                 # Closed eye (line)
                 pygame.draw.line(
-                    self.screen, self.eye_color,
+                    surface, self.eye_color,
                     (eye_x - eye_radius, eye_y),
                     (eye_x + eye_radius, eye_y),
                     4
                 )
             else:
                 # Open eye
-                pygame.draw.circle(self.screen, self.eye_color, (eye_x, eye_y), eye_radius)
+                pygame.draw.circle(surface, self.eye_color, (eye_x, eye_y), eye_radius)
                 
                 # Highlight
                 highlight_offset = eye_radius // 3
                 pygame.draw.circle(
-                    self.screen, (255, 255, 255),
+                    surface, (255, 255, 255),
                     (eye_x - highlight_offset, eye_y - highlight_offset),
                     eye_radius // 3
                 )
@@ -190,55 +381,61 @@ class FaceAnimator:
                 # Listening: eyes look up
                 if self.emotion == Emotion.LISTENING:
                     pygame.draw.circle(
-                        self.screen, self.eye_color,
+                        surface, self.eye_color,
                         (eye_x, eye_y - eye_radius // 2),
                         eye_radius // 2
                     )
                     
-    def _draw_mouth(self, cx: int, cy: int, r: int):
+    def _draw_mouth(self, surface: pygame.Surface, cx: int, cy: int, r: int):
         """Draw the mouth."""
         mouth_y = cy + r // 3
         mouth_width = r // 2
         
-        if self.emotion == Emotion.SPEAKING or self.mouth_open > 0.1:
+        mouth_height = self._mouth_height()
+        if mouth_height is not None:
             # Open mouth (ellipse)
-            mouth_height = int(r // 4 * self.mouth_open)
             if mouth_height > 2:
                 pygame.draw.ellipse(
-                    self.screen, self.mouth_color,
+                    surface, self.mouth_color,
                     (cx - mouth_width // 2, mouth_y - mouth_height // 2,
                      mouth_width, mouth_height)
                 )
         elif self.emotion == Emotion.HAPPY:
             # Big smile (arc)
             rect = pygame.Rect(cx - mouth_width, mouth_y - r // 4, mouth_width * 2, r // 2)
-            pygame.draw.arc(self.screen, self.mouth_color, rect, 3.14, 0, 4)
+            pygame.draw.arc(surface, self.mouth_color, rect, 3.14, 0, 4)
         elif self.emotion == Emotion.THINKING:
             # Small 'o' mouth
-            pygame.draw.circle(self.screen, self.mouth_color, (cx, mouth_y), r // 10)
+            pygame.draw.circle(surface, self.mouth_color, (cx, mouth_y), r // 10)
         elif self.emotion == Emotion.LISTENING:
             # Slight smile
             rect = pygame.Rect(cx - mouth_width // 2, mouth_y - r // 6, mouth_width, r // 3)
-            pygame.draw.arc(self.screen, self.mouth_color, rect, 3.14, 0, 3)
+            pygame.draw.arc(surface, self.mouth_color, rect, 3.14, 0, 3)
         else:
             # Neutral smile
             pygame.draw.arc(
-                self.screen, self.mouth_color,
+                surface, self.mouth_color,
                 (cx - mouth_width // 2, mouth_y - r // 8, mouth_width, r // 4),
                 3.14, 0, 3
             )
             
-    def _draw_cheeks(self, cx: int, cy: int, r: int):
+    def _draw_cheeks(self, surface: pygame.Surface, cx: int, cy: int, r: int):
         """Draw rosy cheeks."""
         cheek_y = cy + r // 8
         cheek_offset = r // 2
         cheek_radius = r // 8
         
+        if self._cheek_sprite is None:
+            # Semi-transparent pink circle
+            self._cheek_sprite = self._new_surface((cheek_radius * 2, cheek_radius * 2), alpha=True)
+            self._cheek_sprite.fill((0, 0, 0, 0))
+            pygame.draw.circle(
+                self._cheek_sprite, (*self.cheek_color, 100),
+                (cheek_radius, cheek_radius), cheek_radius
+            )
+            
         for cheek_x in [cx - cheek_offset, cx + cheek_offset]:
-            # Semi-transparent pink circles
-            s = pygame.Surface((cheek_radius * 2, cheek_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.cheek_color, 100), (cheek_radius, cheek_radius), cheek_radius)
-            self.screen.blit(s, (cheek_x - cheek_radius, cheek_y - cheek_radius))
+            surface.blit(self._cheek_sprite, (cheek_x - cheek_radius, cheek_y - cheek_radius))
             
     def _draw_thinking_dots(self, cx: int, cy: int, r: int):
         """Draw animated thinking dots above head."""
@@ -246,12 +443,20 @@ class FaceAnimator:
         num_dots = 3
         spacing = 20
         
+        if not self._dot_sprites:
+            # One dot per opacity level, faint to solid
+            for level in range(DOT_ALPHA_LEVELS):
+                dot = self._new_surface((12, 12), alpha=True)
+                dot.fill((0, 0, 0, 0))
+                alpha = round(1 + 254 * level / (DOT_ALPHA_LEVELS - 1))
+                pygame.draw.circle(dot, (150, 150, 255, alpha), (6, 6), 6)
+                self._dot_sprites.append(dot)
+                
         for i in range(num_dots):
             # Animate each dot with offset timing
             phase = self.animation_time * 3 + i * 0.5
             alpha = int(128 + 127 * math.sin(phase))
             dot_x = cx + (i - 1) * spacing
             
-            s = pygame.Surface((12, 12), pygame.SRCALPHA)
-            pygame.draw.circle(s, (150, 150, 255, alpha), (6, 6), 6)
-            self.screen.blit(s, (dot_x - 6, dot_y - 6 - int(5 * math.sin(phase))))
+            dot = self._dot_sprites[round((alpha - 1) / 254 * (DOT_ALPHA_LEVELS - 1))]
+            self.screen.blit(dot, (dot_x - 6, dot_y - 6 - int(5 * math.sin(phase))))
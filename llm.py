@@ -4,14 +4,48 @@ LLM Integration Module
 Supports OpenAI API (cloud) and Ollama (local) backends.
 """
 
+import json
+import threading
 import requests
-from typing import List, Dict
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Iterator
+from urllib3.util.retry import Retry
 
 from config import (
     LLM_BACKEND, OLLAMA_HOST, LLM_MODEL, SYSTEM_PROMPT,
     OPENAI_API_KEY, OPENAI_MODEL
 )
 
+# Spoken when the backend fails before producing any text
+ERROR_REPLY = "I'm having trouble thinking right now. Could you try again?"
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+def create_session() -> requests.Session:
+    """
+    Create a keep-alive HTTP session for LLM calls.
+    Reusing pooled connections skips the TCP (and TLS) handshake on every turn.
+    """
+    session = requests.Session()
+
+    # Retry connection failures and overload responses, but never re-send a
+    # request whose response was already being read (that would regenerate)
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=2,
+        backoff_factor=0.25,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class LLMClient:
     """
@@ -22,10 +56,15 @@ class LLMClient:
         self.system_prompt = SYSTEM_PROMPT
         self.backend = LLM_BACKEND
         self.available = False
+        self.session = create_session()
 
         if self.backend == "openai":
             self.available = self._check_openai()
+            if self.available:
+                # Open the TLS connection now so the first turn doesn't pay for it
+                threading.Thread(target=self._prewarm_openai, daemon=True).start()
         else:
+            # The availability probe below also opens the pooled connection
             self.host = OLLAMA_HOST
             self.model = LLM_MODEL
             self.available = self._check_ollama()
@@ -39,10 +78,17 @@ class LLMClient:
         print(f"✓ OpenAI configured, using model '{OPENAI_MODEL}'")
         return True
 
+    def _prewarm_openai(self):
+        """Establish a pooled connection to the OpenAI API."""
+        try:
+            self.session.head(OPENAI_BASE_URL, timeout=5)
+        except requests.exceptions.RequestException:
+            pass  # The first real request will connect instead
+
     def _check_ollama(self) -> bool:
         """Check if Ollama is running and model is available."""
         try:
-            response = requests.get(f"{self.host}/api/tags", timeout=5)
+            response = self.session.get(f"{self.host}/api/tags", timeout=5)
             if response.status_code == 200:
                 models = response.json().get("models", [])
                 model_names = [m.get("name", "") for m in models]
@@ -81,12 +127,42 @@ class LLMClient:
                 return self._ollama_chat(full_messages)
         except Exception as e:
             print(f"LLM error: {e}")
-            return "I'm having trouble thinking right now. Could you try again?"
+            return ERROR_REPLY
 
-    def _openai_chat(self, messages: List[Dict[str, str]]) -> str:
-        """Chat via OpenAI API."""
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
+    def chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """
+        Send chat messages and yield the response text as it is generated.
+
+        Chunks are yielded as soon as the backend produces them, so callers
+        can start speaking before the full reply is known.
+        """
+        if not self.available:
+            yield self._mock_response(messages)
+            return
+
+        full_messages = [
+            {"role": "system", "content": self.system_prompt}
+        ] + messages
+
+        produced = False
+        try:
+            if self.backend == "openai":
+                stream = self._openai_chat_stream(full_messages)
+            else:
+                stream = self._ollama_chat_stream(full_messages)
+            for token in stream:
+                if token:
+                    produced = True
+                    yield token
+        except Exception as e:
+            print(f"LLM error: {e}")
+            if not produced:
+                yield ERROR_REPLY
+
+    def _openai_request(self, messages: List[Dict[str, str]], stream: bool) -> requests.Response:
+        """POST a chat completion request to the OpenAI API."""
+        return self.session.post(
+            f"{OPENAI_BASE_URL}/chat/completions",
             headers={
                 "Authorization": f"Bearer {OPENAI_API_KEY}",
                 "Content-Type": "application/json",
@@ -96,24 +172,47 @@ class LLMClient:
                 "messages": messages,
                 "max_tokens": 150,
                 "temperature": 0.7,
+                "stream": stream,
             },
-            timeout=30
+            timeout=30,
+            stream=stream
         )
 
+    def _openai_chat(self, messages: List[Dict[str, str]]) -> str:
+        """Chat via OpenAI API."""
+        response = self._openai_request(messages, stream=False)
+
         if response.status_code == 200:
             result = response.json()
             return result["choices"][0]["message"]["content"].strip()
         else:
             raise RuntimeError(f"OpenAI error {response.status_code}: {response.text}")
 
-    def _ollama_chat(self, messages: List[Dict[str, str]]) -> str:
-        """Chat via local Ollama."""
-        response = requests.post(
+    def _openai_chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream a chat via OpenAI API (server-sent events)."""
+        with self._openai_request(messages, stream=True) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"OpenAI error {response.status_code}: {response.text}")
+
+            # text/event-stream without a charset would otherwise decode as ISO-8859-1
+            response.encoding = "utf-8"
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                yield choices[0].get("delta", {}).get("content") or ""
+
+    def _ollama_request(self, messages: List[Dict[str, str]], stream: bool) -> requests.Response:
+        """POST a chat request to the local Ollama server."""
+        return self.session.post(
             f"{self.host}/api/chat",
             json={
                 "model": self.model,
                 "messages": messages,
-                "stream": False,
+                "stream": stream,
                 "keep_alive": "30m",
                 "options": {
                     "temperature": 0.7,
@@ -123,15 +222,36 @@ class LLMClient:
                     "num_thread": 4,
                 }
             },
-            timeout=300
+            timeout=300,
+            stream=stream
         )
 
+    def _ollama_chat(self, messages: List[Dict[str, str]]) -> str:
+        """Chat via local Ollama."""
+        response = self._ollama_request(messages, stream=False)
+
         if response.status_code == 200:
             result = response.json()
             return result.get("message", {}).get("content", "").strip()
         else:
             raise RuntimeError(f"Ollama error: {response.status_code}")
 
+    def _ollama_chat_stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """Stream a chat via local Ollama (newline-delimited JSON)."""
+        with self._ollama_request(messages, stream=True) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Ollama error: {response.status_code}")
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                yield chunk.get("message", {}).get("content", "")
+                if chunk.get("done"):
+                    break
+
     def _mock_response(self, messages: List[Dict[str, str]]) -> str:
         """Generate a mock response when no LLM is available."""
         import random
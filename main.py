@@ -12,17 +12,22 @@ import threading
 import queue
 import sys
 from enum import Enum, auto
+from typing import Optional
 
 import pygame
 
 from config import (
     SCREEN_WIDTH, SCREEN_HEIGHT, FULLSCREEN, FPS,
-    BACKGROUND_COLOR, TOUCH_ENABLED, TAP_TO_LISTEN, TAP_TO_CANCEL
+    BACKGROUND_COLOR, TOUCH_ENABLED, TAP_TO_LISTEN, TAP_TO_CANCEL,
+    STATUS_READY, STATUS_LISTENING, STATUS_THINKING, STATUS_SPEAKING,
+    DIRTY_RECT_RENDERING, WARM_UP_ON_START
 )
 from face import FaceAnimator
 from voice import VoiceRecognizer
 from llm import LLMClient
 from tts import TextToSpeech
+from startup import StartupTracker
+from text_cache import TextCache
 
 
 class AssistantState(Enum):
@@ -33,25 +38,51 @@ class AssistantState(Enum):
     SPEAKING = auto()       # TTS is playing response
 
 
+# Status bar color and caption per state
+STATUS_COLORS = {
+    AssistantState.IDLE: STATUS_READY,
+    AssistantState.LISTENING: STATUS_LISTENING,
+    AssistantState.THINKING: STATUS_THINKING,
+    AssistantState.SPEAKING: STATUS_SPEAKING
+}
+STATUS_TEXT = {
+    AssistantState.IDLE: "Listening for 'Hey Max'...",
+    AssistantState.LISTENING: "Listening...",
+    AssistantState.THINKING: "Thinking...",
+}
+STATUS_BAR_HEIGHT = 10
+STATUS_FONT_SIZE = 32
+STATUS_AREA_HEIGHT = 60  # Bar plus caption, redrawn when the status changes
+
+
 class PiAssistant:
     """Main application class for the Pi AI Assistant."""
     
     def __init__(self):
+        # Tracks per-component startup time and readiness
+        self.startup = StartupTracker()
+        
         # Initialize Pygame
         pygame.init()
         pygame.mixer.init()
         
         # Setup display
-        flags = pygame.FULLSCREEN if FULLSCREEN else 0
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
-        pygame.display.set_caption("Pi AI Assistant")
+        self.startup.run("Display", self._init_display)
         self.clock = pygame.time.Clock()
+        self.text_cache = TextCache()
+        self._full_redraw = True  # Next frame repaints the whole screen
+        self._drawn_status = None
         
-        # Initialize components
-        self.face = FaceAnimator(self.screen)
-        self.voice = VoiceRecognizer()
-        self.llm = LLMClient()
-        self.tts = TextToSpeech()
+        # Initialize components. The LLM probe and the Piper check can each
+        # block for seconds, so they run in the background while the face is
+        # already on screen; llm/tts stay None until they are ready.
+        self.llm: Optional[LLMClient] = None
+        self.tts: Optional[TextToSpeech] = None
+        self.startup.start("LLM", self._init_llm)
+        self.startup.start("TTS", self._init_tts)
+        self.face = self.startup.run("Face", lambda: FaceAnimator(self.screen))
+        self.voice = self.startup.run("Voice", VoiceRecognizer)
+        self._interactive = False
         
         # State management
         self.state = AssistantState.IDLE
@@ -59,11 +90,30 @@ class PiAssistant:
         
         # Message queues for thread communication
         self.speech_queue = queue.Queue()
-        self.response_queue = queue.Queue()
+        self.response_queue = queue.Queue()  # (turn, event) from reply threads
+        self._turn = 0  # Bumped per reply and on cancel; older events are ignored
         
         # Conversation history (for context)
         self.conversation = []
         
+    def _init_display(self):
+        """Open the window (fullscreen on the Pi)."""
+        flags = pygame.FULLSCREEN if FULLSCREEN else 0
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
+        pygame.display.set_caption("Pi AI Assistant")
+        
+    def _init_llm(self) -> bool:
+        self.llm = LLMClient()
+        return self.llm.available
+        
+    def _init_tts(self):
+        self.tts = TextToSpeech()
+        
+    def _wait_for_components(self):
+        """Block until the LLM and TTS components have been created."""
+        self.startup.wait("LLM")
+        self.startup.wait("TTS")
+        
     def set_state(self, new_state: AssistantState):
         """Change the assistant's state and update face."""
         self.state = new_state
@@ -97,6 +147,8 @@ class PiAssistant:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self._full_redraw = True
             elif event.type == pygame.KEYDOWN:
                 self._handle_keydown(event)
             elif event.type == pygame.MOUSEBUTTONDOWN and TOUCH_ENABLED:
@@ -123,7 +175,9 @@ class PiAssistant:
         
     def cancel_speech(self):
         """Stop current speech output."""
-        self.tts.stop()
+        self._turn += 1  # Ignore the rest of the cancelled reply
+        if self.tts:
+            self.tts.stop()
         self.set_state(AssistantState.IDLE)
         
     def process_speech(self, text: str):
@@ -131,42 +185,40 @@ class PiAssistant:
         self.set_state(AssistantState.THINKING)
         
         # Add to conversation history
-        self.conversation.append({"role": "user", "content": text})
+        self._remember("user", text)
+        self._turn += 1
+        turn = self._turn
         
-        def get_response():
+        def respond():
+            # Speak the reply sentence by sentence while the LLM is still
+            # generating; the face switches to SPEAKING on the first audio.
+            reply = ""
             try:
-                response = self.llm.chat(self.conversation)
-                self.response_queue.put(response)
+                self._wait_for_components()
+                reply = self.tts.speak_stream(
+                    self.llm.chat_stream(self.conversation),
+                    on_start=lambda: self.response_queue.put((turn, "__SPEECH_START__"))
+                )
             except Exception as e:
-                print(f"LLM error: {e}")
-                self.response_queue.put("Sorry, I had trouble thinking about that.")
-                
-        thread = threading.Thread(target=get_response, daemon=True)
+                print(f"LLM/TTS error: {e}")
+            finally:
+                # Only what was actually spoken (a cancelled reply is cut short)
+                if reply:
+                    print(f"Max: {reply}")
+                    self._remember("assistant", reply)
+                self.response_queue.put((turn, "__SPEECH_DONE__"))
+
+        thread = threading.Thread(target=respond, daemon=True)
         thread.start()
-        
-    def speak_response(self, text: str):
-        """Speak the LLM response using TTS."""
-        self.set_state(AssistantState.SPEAKING)
-        
-        # Add to conversation history
-        self.conversation.append({"role": "assistant", "content": text})
-        
+
+    def _remember(self, role: str, text: str):
+        """Add a message to the conversation history."""
+        self.conversation.append({"role": role, "content": text})
+
         # Keep conversation history manageable (last 10 exchanges)
         if len(self.conversation) > 20:
             self.conversation = self.conversation[-20:]
         
-        def speak():
-            try:
-                self.tts.speak(text)
-            except Exception as e:
-                print(f"TTS error: {e}")
-            finally:
-                # Signal speech complete
-                self.response_queue.put("__SPEECH_DONE__")
-                
-        thread = threading.Thread(target=speak, daemon=True)
-        thread.start()
-        
     def check_wake_word(self):
         """Check for wake word in background (when idle)."""
         if self.state == AssistantState.IDLE and self.voice.check_wake_word():
@@ -187,57 +239,74 @@ class PiAssistant:
             
         # Check for LLM response
         try:
-            response = self.response_queue.get_nowait()
-            if response == "__SPEECH_DONE__":
+            turn, response = self.response_queue.get_nowait()
+            if turn != self._turn:
+                pass  # From a reply that was cancelled
+            elif response == "__SPEECH_START__":
+                if self.state == AssistantState.THINKING:
+                    self.set_state(AssistantState.SPEAKING)
+            elif response == "__SPEECH_DONE__":
                 self.set_state(AssistantState.IDLE)
-            elif self.state == AssistantState.THINKING:
-                print(f"Max: {response}")
-                self.speak_response(response)
         except queue.Empty:
             pass
             
+        # Report startup timing once the LLM and TTS are usable
+        if not self._interactive and self.startup.is_done("LLM", "TTS"):
+            self._interactive = True
+            self.startup.mark("Interactive")
+            print(self.startup.report(interactive="Interactive"))
+            
         # Update face animation
         self.face.update()
         
     def render(self):
         """Render the display."""
+        if not DIRTY_RECT_RENDERING:
+            self.screen.fill(BACKGROUND_COLOR)
+            self.face.draw()
+            self.draw_status_indicator()
+            pygame.display.flip()
+            return
+            
+        # Redraw and push only the areas that changed since the last frame
+        rects = self.face.dirty_rects()
+        status = (self.state, self._interactive)
+        if status != self._drawn_status:
+            rects.append(pygame.Rect(0, SCREEN_HEIGHT - STATUS_AREA_HEIGHT,
+                                     SCREEN_WIDTH, STATUS_AREA_HEIGHT))
+            self._drawn_status = status
+        if self._full_redraw:
+            rects = [self.screen.get_rect()]
+            self._full_redraw = False
+        if not rects:
+            return
+        
+        # One clipped pass over the union; unchanged pixels inside it are
+        # redrawn identically, so only the dirty rects need to be pushed
+        self.screen.set_clip(rects[0].unionall(rects[1:]))
         self.screen.fill(BACKGROUND_COLOR)
         self.face.draw()
-        
-        # Draw status indicator
         self.draw_status_indicator()
-        
-        pygame.display.flip()
+        self.screen.set_clip(None)
+        pygame.display.update(rects)
         
     def draw_status_indicator(self):
         """Draw colored status bar at bottom of screen."""
-        from config import STATUS_READY, STATUS_LISTENING, STATUS_THINKING, STATUS_SPEAKING
-        
-        colors = {
-            AssistantState.IDLE: STATUS_READY,
-            AssistantState.LISTENING: STATUS_LISTENING,
-            AssistantState.THINKING: STATUS_THINKING,
-            AssistantState.SPEAKING: STATUS_SPEAKING
-        }
-        
-        color = colors.get(self.state, STATUS_READY)
-        bar_height = 10
+        color = STATUS_COLORS.get(self.state, STATUS_READY)
         pygame.draw.rect(
             self.screen, color,
-            (0, SCREEN_HEIGHT - bar_height, SCREEN_WIDTH, bar_height)
+            (0, SCREEN_HEIGHT - STATUS_BAR_HEIGHT, SCREEN_WIDTH, STATUS_BAR_HEIGHT)
         )
 
-        # Draw status text above the bar
-        status_text = {
-            AssistantState.IDLE: "Listening for 'Hey Max'...",
-            AssistantState.LISTENING: "Listening...",
-            AssistantState.THINKING: "Thinking...",
-        }
-        text = status_text.get(self.state)
+        # Draw status text above the bar (rendered once per state, then cached)
+        text = STATUS_TEXT.get(self.state)
+        if self.state == AssistantState.IDLE and not self._interactive:
+            text = "Starting up..."
         if text:
-            font = pygame.font.SysFont(None, 32)
-            text_surface = font.render(text, True, color)
-            text_rect = text_surface.get_rect(centerx=SCREEN_WIDTH // 2, bottom=SCREEN_HEIGHT - bar_height - 8)
+            text_surface = self.text_cache.render(text, STATUS_FONT_SIZE, color)
+            text_rect = text_surface.get_rect(
+                centerx=SCREEN_WIDTH // 2, bottom=SCREEN_HEIGHT - STATUS_BAR_HEIGHT - 8
+            )
             self.screen.blit(text_surface, text_rect)
         
     def run(self):
@@ -251,23 +320,58 @@ class PiAssistant:
         print("  - Press ESC to quit")
         print("=" * 50)
         
-        # Start wake word detection in background
-        self.voice.start_wake_word_detection(callback=self.start_listening)
+        if WARM_UP_ON_START:
+            # Load models in the background while the face is already on screen
+            self.start_warm_up()
+        else:
+            # Start wake word detection in background
+            self.voice.start_wake_word_detection(callback=self.start_listening)
         
         try:
+            first_frame = True
             while self.running:
                 self.handle_events()
                 self.update()
                 self.render()
+                if first_frame:
+                    self.startup.mark("First frame")
+                    first_frame = False
                 self.clock.tick(FPS)
         finally:
             self.cleanup()
             
+    def start_warm_up(self):
+        """Load Whisper, Vosk and the TTS voice concurrently in background threads."""
+        self.startup.start("Whisper", self.voice.warm_up_transcription)
+        self.startup.start("Wake word", self._warm_up_wake_word)
+        self.startup.start("TTS voice", self._warm_up_tts)
+        
+    def _warm_up_tts(self) -> bool:
+        """Once TextToSpeech exists, load its voice."""
+        self.startup.wait("TTS")
+        return self.tts is not None and self.tts.warm_up()
+        
+    def _warm_up_wake_word(self) -> bool:
+        """Load the wake word backend, then begin listening for the wake word."""
+        ready = self.voice.warm_up_wake_word()
+        self.voice.start_wake_word_detection(callback=self.start_listening)
+        return ready
+        
     def cleanup(self):
         """Clean up resources."""
         print("Shutting down...")
+        stats = self.voice.audio_stats()
+        print(f"Audio: {stats['dropped_blocks']} wake word blocks dropped "
+              f"(queue high-water {stats['queue_high_water']}/{stats['queue_size']}), "
+              f"{stats.get('input_overflows', 0)} input overflows")
+        commands = self.voice.command_stats()
+        if commands.get("utterances"):
+            print(f"Command fast path: {commands['hits']}/{commands['utterances']} hits "
+                  f"({commands['hit_rate']:.0%}), {commands['hit_ms']:.0f} ms per hit vs "
+                  f"{commands['whisper_ms']:.0f} ms via Whisper")
         self.voice.stop()
-        self.tts.stop()
+        if self.tts:
+            self.tts.stop()
         pygame.quit()
 
 
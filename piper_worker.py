@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Persistent Piper Worker
+Keeps a Piper voice model loaded in memory and synthesizes jobs from a queue.
+"""
+
+import os
+import threading
+import queue
+from typing import Optional, Iterator, List
+
+from config import TTS_SAMPLE_RATE
+
+
+def find_voice_model(voice: str) -> Optional[str]:
+    """Locate the .onnx file for a Piper voice name (or return a direct path)."""
+    if voice.endswith(".onnx") and os.path.exists(voice):
+        return voice
+
+    search_dirs = [
+        "models/piper",
+        "models",
+        ".",
+        os.path.expanduser("~/.local/share/piper"),
+        os.path.expanduser("~/.cache/piper"),
+        "/usr/share/piper/voices",
+    ]
+    for directory in search_dirs:
+        path = os.path.join(directory, f"{voice}.onnx")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class SynthesisJob:
+    """
+    A queued synthesis request.
+    Audio is delivered as raw 16-bit mono PCM chunks as the worker produces them.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.cancelled = False
+        self.completed = False  # Set once all audio was produced without error
+        self.chunks: queue.Queue = queue.Queue()
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        """Yield audio chunks until the job is finished."""
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                return
+            yield chunk
+
+    def result(self) -> bytes:
+        """Block until the job is finished and return all of its audio."""
+        return b"".join(self.iter_chunks())
+
+    def cancel(self):
+        """Ask the worker to stop producing audio for this job."""
+        self.cancelled = True
+
+
+class PiperWorker:
+    """
+    Long-lived Piper synthesizer.
+    Loads the voice once via the piper Python API and serves synthesis jobs
+    from a background thread, instead of spawning (and reloading the ONNX
+    model in) a new piper process for every utterance.
+    """
+
+    def __init__(self, voice: str, length_scale: float = 1.0):
+        self.voice = voice
+        self.length_scale = length_scale
+        self.sample_rate = TTS_SAMPLE_RATE
+
+        self.jobs: queue.Queue = queue.Queue()
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._voice = None
+
+    def start(self) -> bool:
+        """Load the voice model and start the worker thread."""
+        if self.running:
+            return True
+
+        try:
+            from piper.voice import PiperVoice
+        except ImportError:
+            print("⚠ piper Python API not installed, using piper CLI per utterance")
+            return False
+
+        model_path = find_voice_model(self.voice)
+        if model_path is None:
+            print(f"⚠ Piper voice '{self.voice}.onnx' not found, using piper CLI per utterance")
+            return False
+
+        try:
+            print(f"Loading Piper voice from {model_path}...")
+            self._voice = PiperVoice.load(model_path)
+            self.sample_rate = self._voice.config.sample_rate
+        except Exception as e:
+            print(f"⚠ Could not load Piper voice: {e}")
+            return False
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print("✓ Piper worker ready")
+        return True
+
+    def submit(self, text: str) -> SynthesisJob:
+        """Queue text for synthesis and return its job handle."""
+        job = SynthesisJob(text)
+        self.jobs.put(job)
+        return job
+
+    def synthesize(self, text: str) -> bytes:
+        """Synthesize text and return raw 16-bit mono PCM."""
+        return self.submit(text).result()
+
+    def _run(self):
+        """Worker thread: synthesize queued jobs one after another."""
+        while self.running:
+            job = self.jobs.get()
+            if job is None:
+                break
+            try:
+                for chunk in self._synthesize(job.text):
+                    if job.cancelled or not self.running:
+                        break
+                    job.chunks.put(chunk)
+                else:
+                    job.completed = True
+            except Exception as e:
+                print(f"Piper worker error: {e}")
+            finally:
+                job.chunks.put(None)
+
+    def _synthesize(self, text: str) -> Iterator[bytes]:
+        """Run the loaded voice on text, yielding PCM as it is produced."""
+        if hasattr(self._voice, "synthesize_stream_raw"):
+            # piper-tts 1.2.x
+            yield from self._voice.synthesize_stream_raw(
+                text, length_scale=self.length_scale
+            )
+        else:
+            # piper-tts 1.3+
+            from piper import SynthesisConfig
+            config = SynthesisConfig(length_scale=self.length_scale)
+            for chunk in self._voice.synthesize(text, syn_config=config):
+                yield chunk.audio_int16_bytes
+
+    def stop(self):
+        """Stop the worker thread, cancelling any pending jobs."""
+        self.running = False
+        pending: List[SynthesisJob] = []
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                pending.append(job)
+        for job in pending:
+            job.chunks.put(None)
+        self.jobs.put(None)
+        if self.thread:
+            self.thread.join(timeout=1.0)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Startup Tracking
+Runs slow component initialization in background threads and records when
+each component becomes ready.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Any
+
+
+class ComponentStatus:
+    """Readiness and timing of one background startup task."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ok = False
+        self.error: Optional[str] = None
+        self.seconds = 0.0
+        self.finished_at = 0.0  # Seconds since tracker creation
+        self.done = threading.Event()
+
+    @property
+    def state(self) -> str:
+        if not self.done.is_set():
+            return "loading"
+        return "ready" if self.ok else "unavailable"
+
+
+class StartupTracker:
+    """
+    Starts named tasks in daemon threads and tracks their readiness.
+    A task counts as ready unless it raises or returns False.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.components: Dict[str, ComponentStatus] = {}
+
+    def start(self, name: str, task: Callable[[], Any]) -> ComponentStatus:
+        """Run task in the background under the given component name."""
+        status = ComponentStatus(name)
+        self.components[name] = status
+        thread = threading.Thread(target=self._run, args=(status, task), daemon=True)
+        thread.start()
+        return status
+
+    def run(self, name: str, task: Callable[[], Any]) -> Any:
+        """
+        Run task in the calling thread, recording it like a background one.
+        Unlike start(), a failure is re-raised: these are required components.
+        """
+        status = ComponentStatus(name)
+        self.components[name] = status
+        result = []
+        errors = []
+
+        def wrapped():
+            try:
+                result.append(task())
+            except Exception as e:
+                errors.append(e)
+                raise
+            return result[0]
+
+        self._run(status, wrapped)
+        if errors:
+            raise errors[0]
+        return result[0]
+
+    def mark(self, name: str):
+        """Record a milestone (e.g. first frame drawn) at the current time."""
+        status = ComponentStatus(name)
+        status.ok = True
+        status.finished_at = time.perf_counter() - self.started_at
+        status.done.set()
+        self.components[name] = status
+
+    def _run(self, status: ComponentStatus, task: Callable[[], Any]):
+        start = time.perf_counter()
+        try:
+            status.ok = task() is not False
+        except Exception as e:
+            status.error = str(e)
+            print(f"⚠ {status.name} failed to start: {e}")
+        finally:
+            end = time.perf_counter()
+            status.seconds = end - start
+            status.finished_at = end - self.started_at
+            status.done.set()
+            symbol = "✓" if status.ok else "⚠"
+            print(f"{symbol} {status.name} {status.state} ({status.seconds:.2f}s)")
+
+    def is_done(self, *names: str) -> bool:
+        """True once all named components have finished starting (ready or not)."""
+        return all(
+            name in self.components and self.components[name].done.is_set()
+            for name in names
+        )
+
+    def is_ready(self, name: str) -> bool:
+        status = self.components.get(name)
+        return bool(status and status.done.is_set() and status.ok)
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> bool:
+        """Block until the named component has finished starting."""
+        status = self.components.get(name)
+        if status is None:
+            return False
+        status.done.wait(timeout)
+        return status.ok
+
+    def all_done(self) -> bool:
+        return all(status.done.is_set() for status in self.components.values())
+
+    def report(self, interactive: Optional[str] = None) -> str:
+        """
+        Human-readable per-component startup timing.
+        If `interactive` names a component, its finish time is reported as the
+        total time-to-interactive.
+        """
+        lines = ["Startup timing:"]
+        done = [s for s in self.components.values() if s.done.is_set()]
+        for status in sorted(done, key=lambda s: s.finished_at):
+            lines.append(
+                f"  {status.name:<14} {status.state:<12} "
+                f"{status.seconds:6.2f}s (done at {status.finished_at:6.2f}s)"
+            )
+        for status in self.components.values():
+            if not status.done.is_set():
+                lines.append(f"  {status.name:<14} {status.state}")
+        if interactive in self.components:
+            lines.append(f"  Time to interactive: {self.components[interactive].finished_at:.2f}s")
+        return "\n".join(lines)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Streaming Transcription
+Decodes a recording incrementally while the user is still speaking, so that
+only a short tail remains to be transcribed once end of speech is detected.
+"""
+
+import threading
+import numpy as np
+from typing import Callable, List, Optional, Tuple
+
+from audio_capture import AudioRingBuffer
+
+# (start seconds, end seconds, text) relative to the decoded audio
+Segment = Tuple[float, float, str]
+
+
+class StreamingTranscriber:
+    """
+    Background worker that transcribes a growing recording in passes.
+
+    Each pass decodes everything after the last committed point with word
+    timestamps. Words that end well before the current end of audio are
+    committed (their text is final and decoding moves past them); the most
+    recent `tail_seconds` stay uncommitted and are decoded again on the next
+    pass, with more context, overlapping the previous window. If the last
+    pass already reached the end of speech, its text is the final result.
+    """
+
+    def __init__(self, transcribe: Callable[..., List[Segment]],
+                 ring: AudioRingBuffer, start: int, sample_rate: int,
+                 chunk_seconds: float, tail_seconds: float,
+                 buffer: Optional[np.ndarray] = None):
+        self.transcribe = transcribe
+        self.ring = ring
+        self.sample_rate = sample_rate
+        self.chunk = int(chunk_seconds * sample_rate)
+        self.step = self.chunk // 2  # New audio needed before decoding again
+        self.tail = tail_seconds
+
+        self.committed = start  # Absolute sample position decoded for good
+        self.committed_text: List[str] = []
+        self.passes = 0
+        self._last_end = start
+        self._last_text = ""  # Full text of the last pass, committed part included
+
+        # Audio is converted into the caller's buffer when given one
+        self._buffer = buffer if buffer is not None else np.empty(ring.capacity, dtype=np.float32)
+        self._stop = threading.Event()
+        self._pass_lock = threading.Lock()  # Held while a pass is decoding
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        """Decode whenever enough new audio has accumulated past the committed point."""
+        while not self._stop.is_set():
+            end = self.ring.position
+            target = max(self.committed + self.chunk, self._last_end + self.step)
+            if end < target:
+                self.ring.wait(target - 1, timeout=0.2)
+                continue
+            with self._pass_lock:
+                if self._stop.is_set():
+                    break
+                try:
+                    self._decode(end, final=False)
+                    self._last_end = end
+                except Exception as e:
+                    print(f"Streaming transcription error: {e}")
+                    return
+
+    def _decode(self, end: int, final: bool) -> str:
+        """
+        Decode [committed, end). Returns the text of the uncommitted part;
+        for non-final passes, commits the words that lie outside the tail.
+        """
+        audio = self.ring.read_float(self.committed, end, out=self._buffer)
+        if len(audio) < self.sample_rate // 10:  # Less than 0.1 seconds
+            return ""
+
+        # Word timestamps let a single long segment be committed piecewise
+        words = self.transcribe(audio, " ".join(self.committed_text),
+                                word_timestamps=not final)
+        self.passes += 1
+        text = " ".join(word.strip() for _, _, word in words if word.strip())
+        if final:
+            return text
+        self._last_text = " ".join(self.committed_text + [text])
+
+        horizon = len(audio) / self.sample_rate - self.tail
+        committed_until = 0.0
+        for _, word_end, word in words:
+            if word_end > horizon:
+                break
+            if word.strip():
+                self.committed_text.append(word.strip())
+            committed_until = word_end
+        self.committed += int(committed_until * self.sample_rate)
+        return ""
+
+    def cancel(self):
+        """Stop the worker without waiting for it; any pass in progress is discarded."""
+        self._stop.set()
+
+    def finish(self, end: int, speech_end: Optional[int] = None) -> Optional[str]:
+        """
+        Stop the worker, decode whatever is left up to end, and return the full text.
+        If the last pass already covered speech_end, its text is returned as is.
+        """
+        self._stop.set()
+        with self._pass_lock:
+            pass  # A pass in progress either commits or becomes the result
+
+        if speech_end is not None and self.passes and self._last_end >= speech_end:
+            text = self._last_text.strip()
+        else:
+            tail_text = self._decode(end, final=True) if end > self.committed else ""
+            text = " ".join(self.committed_text + [tail_text]).strip()
+        return text if text else None
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Text Surface Cache
+Keeps fonts and rendered text surfaces, so the UI doesn't re-resolve the
+system font and re-rasterize the same strings every frame.
+"""
+
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+Color = Tuple[int, int, int]
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (text, size, color), least recently used evicted."""
+
+    def __init__(self, font_name: Optional[str] = None, max_entries: int = 64):
+        self.font_name = font_name
+        self.max_entries = max_entries
+        self._fonts: Dict[int, pygame.font.Font] = {}
+        self._surfaces: "OrderedDict[Tuple[str, int, Color], pygame.Surface]" = OrderedDict()
+
+    def font(self, size: int) -> pygame.font.Font:
+        font = self._fonts.get(size)
+        if font is None:
+            font = self._fonts[size] = pygame.font.SysFont(self.font_name, size)
+        return font
+
+    def render(self, text: str, size: int, color: Color) -> pygame.Surface:
+        """Anti-aliased text surface; rendered only the first time it is asked for."""
+        key = (text, size, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+
+        surface = self.font(size).render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
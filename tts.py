@@ -7,12 +7,191 @@ Handles speech synthesis using Piper TTS (local) or fallback to pyttsx3.
 import subprocess
 import threading
 import queue
-import os
-import tempfile
-from pathlib import Path
-from typing import Optional
+import io
+import re
+import wave
+from typing import Optional, Iterable, Iterator, Generator, Callable, List
 
-from config import TTS_VOICE, TTS_SPEED, IS_RASPBERRY_PI
+from config import (
+    TTS_VOICE, TTS_SPEED, TTS_SAMPLE_RATE, TTS_STREAM_AUDIO,
+    TTS_CACHE_ENABLED, TTS_CACHE_DIR, TTS_CACHE_MAX_MB, IS_RASPBERRY_PI
+)
+from audio_cache import AudioCache
+from piper_worker import PiperWorker, SynthesisJob
+
+# Read size for Piper's raw output (~90 ms of 22.05 kHz audio)
+PCM_CHUNK_BYTES = 4096
+
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets)
+# followed by whitespace
+SENTENCE_END = re.compile(r'([.!?]+["\')\]]*)\s+')
+
+
+def split_sentences(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Regroup streamed text fragments into complete sentences.
+
+    A sentence is yielded as soon as the whitespace following its final
+    punctuation arrives; any trailing text is yielded at the end.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            match = SENTENCE_END.search(buffer)
+            if not match:
+                break
+            sentence = buffer[:match.end(1)].strip()
+            buffer = buffer[match.end():]
+            if sentence:
+                yield sentence
+
+    if buffer.strip():
+        yield buffer.strip()
+
+
+def _default_output() -> str:
+    """Pick the PCM output backend for this platform."""
+    if TTS_STREAM_AUDIO:
+        try:
+            import sounddevice  # noqa: F401
+            return "sounddevice"
+        except Exception:
+            pass
+    return "aplay" if IS_RASPBERRY_PI else "pygame"
+
+
+class PcmPlayer:
+    """
+    Gapless playback of raw 16-bit mono PCM, fed one chunk at a time.
+    Streams straight into a sounddevice output stream when available,
+    otherwise uses a single aplay process (Pi) or queued pygame channels.
+    """
+
+    def __init__(self, sample_rate: int, output: Optional[str] = None):
+        self.sample_rate = sample_rate
+        self.output = output or _default_output()
+        self.stopped = False
+        self._process: Optional[subprocess.Popen] = None
+        self._channel = None
+        self._stream = None
+        self._partial = b""
+
+    def write(self, pcm: bytes):
+        """Queue a chunk of audio behind anything already playing."""
+        if self.stopped or not pcm:
+            return
+
+        # Pipe reads can split a sample; hold back the odd byte
+        pcm = self._partial + pcm
+        whole = len(pcm) - len(pcm) % 2
+        self._partial = pcm[whole:]
+        pcm = pcm[:whole]
+        if not pcm:
+            return
+
+        if self.output == "sounddevice":
+            self._write_sounddevice(pcm)
+        elif self.output == "aplay":
+            self._write_aplay(pcm)
+        else:
+            self._write_pygame(pcm)
+
+    def _write_sounddevice(self, pcm: bytes):
+        """Write audio directly to the output device."""
+        if self._stream is None:
+            import sounddevice as sd
+            self._stream = sd.RawOutputStream(
+                samplerate=self.sample_rate,
+                channels=1,
+                dtype='int16'
+            )
+            self._stream.start()
+        try:
+            self._stream.write(pcm)
+        except Exception as e:
+            print(f"Audio output error: {e}")
+            self.stopped = True
+
+    def _write_aplay(self, pcm: bytes):
+        """Pipe audio into a long-running aplay process."""
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["aplay", "-q", "-t", "raw", "-f", "S16_LE",
+                 "-r", str(self.sample_rate), "-c", "1"],
+                stdin=subprocess.PIPE
+            )
+        try:
+            self._process.stdin.write(pcm)
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self.stopped = True
+
+    def _write_pygame(self, pcm: bytes):
+        """Queue audio on a pygame mixer channel (for Windows)."""
+        import pygame
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
+        # Wrap in a WAV header so the mixer resamples to its own format
+        wav = io.BytesIO()
+        with wave.open(wav, 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(self.sample_rate)
+            w.writeframes(pcm)
+        wav.seek(0)
+        sound = pygame.mixer.Sound(file=wav)
+
+        if self._channel is None or not self._channel.get_busy():
+            self._channel = sound.play()
+            return
+
+        # A channel holds one queued sound; wait for the slot to free up
+        while self._channel.get_queue() is not None and not self.stopped:
+            pygame.time.wait(20)
+        if not self.stopped:
+            self._channel.queue(sound)
+
+    def finish(self):
+        """Block until everything written so far has played."""
+        if self._stream:
+            try:
+                self._stream.stop()  # Plays out buffered audio
+                self._stream.close()
+            except Exception:
+                pass
+        if self._process:
+            try:
+                self._process.stdin.close()
+                self._process.wait()
+            except (BrokenPipeError, OSError):
+                pass
+        if self._channel:
+            import pygame
+            while self._channel.get_busy() and not self.stopped:
+                pygame.time.wait(50)
+
+    def stop(self):
+        """Stop playback immediately and discard queued audio."""
+        self.stopped = True
+        if self._stream:
+            try:
+                self._stream.abort()  # Discards buffered audio
+                self._stream.close()
+            except Exception:
+                pass
+        if self._process:
+            try:
+                self._process.terminate()
+            except Exception:
+                pass
+        if self._channel:
+            try:
+                self._channel.stop()
+            except Exception:
+                pass
 
 
 class TextToSpeech:
@@ -29,10 +208,21 @@ class TextToSpeech:
         self.is_speaking = False
         self.current_process: Optional[subprocess.Popen] = None
         self.speech_queue = queue.Queue()
+        self._player: Optional["PcmPlayer"] = None
+        self._current_job: Optional[SynthesisJob] = None
+        self._cancel = threading.Event()  # Cancel token of the latest utterance
         
         # Initialize TTS engine
         self._piper_available = self._check_piper()
+        self._piper_worker: Optional[PiperWorker] = None
+        self._piper_worker_failed = False
+        self._worker_lock = threading.Lock()
         self._pyttsx_engine = None
+
+        # Cache of synthesized audio for repeated phrases
+        self.cache: Optional[AudioCache] = None
+        if TTS_CACHE_ENABLED:
+            self.cache = AudioCache(TTS_CACHE_DIR, TTS_CACHE_MAX_MB)
         
         if not self._piper_available:
             self._init_pyttsx()
@@ -55,6 +245,27 @@ class TextToSpeech:
             print(f"⚠ Piper check failed: {e}")
         return False
         
+    def _init_piper_worker(self) -> Optional[PiperWorker]:
+        """Start the persistent Piper worker (keeps the voice model loaded)."""
+        with self._worker_lock:
+            if self._piper_worker is None and not self._piper_worker_failed:
+                worker = PiperWorker(self.voice, length_scale=1.0 / self.speed)
+                if worker.start():
+                    self._piper_worker = worker
+                else:
+                    self._piper_worker_failed = True
+            return self._piper_worker
+
+    def warm_up(self) -> bool:
+        """Load the voice and synthesize a short phrase so the first reply is fast."""
+        if not self._piper_available:
+            return self._pyttsx_engine is not None
+        worker = self._init_piper_worker()
+        if worker is not None:
+            # Not tracked as _current_job: a reply may start while this runs
+            return bool(worker.submit("Hello.").result())
+        return self._synthesize_piper("Hello.") is not None
+
     def _init_pyttsx(self):
         """Initialize pyttsx3 as fallback TTS."""
         try:
@@ -87,63 +298,260 @@ class TextToSpeech:
         if not text:
             return
             
-        self.is_speaking = True
+        cancel = self._begin_utterance()
         
         try:
             if self._piper_available:
-                self._speak_piper(text, blocking)
+                self._speak_piper(text, blocking, cancel)
             elif self._pyttsx_engine:
                 self._speak_pyttsx(text, blocking)
             else:
                 # No TTS available, just print
                 print(f"[TTS disabled] Would say: {text}")
         finally:
-            self.is_speaking = False
+            # Non-blocking Piper speech clears the flag from its own thread
+            if blocking or not self._piper_available:
+                self._end_utterance(cancel)
             
-    def _speak_piper(self, text: str, blocking: bool):
+    def speak_stream(self, chunks: Iterable[str],
+                     on_start: Optional[Callable[[], None]] = None) -> str:
+        """
+        Speak text while it is still being generated.
+
+        The incoming chunks are split at sentence boundaries and each
+        sentence is synthesized as soon as it is complete, while earlier
+        sentences are already playing.
+
+        Args:
+            chunks: Text fragments, e.g. tokens streamed from the LLM
+            on_start: Called once, right before the first audio plays
+
+        Returns:
+            The sentences that were actually spoken (all of them unless
+            stop() cancelled the speech)
+        """
+        spoken: List[str] = []
+        cancel = self._begin_utterance()
+
+        def until_cancelled():
+            for chunk in chunks:
+                if cancel.is_set():
+                    break
+                yield chunk
+
+        try:
+            sentences = split_sentences(until_cancelled())
+            if self._piper_available:
+                self._speak_piper_stream(sentences, on_start, cancel, spoken)
+            else:
+                for sentence in sentences:
+                    if cancel.is_set():
+                        break
+                    if on_start:
+                        on_start()
+                        on_start = None
+                    spoken.append(sentence)
+                    if self._pyttsx_engine:
+                        self._speak_pyttsx(sentence, blocking=True)
+                    else:
+                        print(f"[TTS disabled] Would say: {sentence}")
+        finally:
+            # Stop generating (e.g. close the LLM response) once cancelled
+            if hasattr(chunks, "close"):
+                chunks.close()
+            self._end_utterance(cancel)
+
+        return " ".join(spoken)
+
+    def _begin_utterance(self) -> threading.Event:
+        """Start speaking; returns the token that stop() sets to cancel this utterance."""
+        cancel = threading.Event()
+        self._cancel = cancel
+        self.is_speaking = True
+        return cancel
+
+    def _end_utterance(self, cancel: threading.Event):
+        """Clear is_speaking, unless a newer utterance has started since."""
+        if self._cancel is cancel:
+            self.is_speaking = False
+
+    def _speak_piper(self, text: str, blocking: bool, cancel: threading.Event):
         """Speak using Piper TTS."""
+        if blocking:
+            self._speak_piper_stream(split_sentences([text]), None, cancel)
+        else:
+            thread = threading.Thread(
+                target=self._piper_speak_thread,
+                args=(text, cancel),
+                daemon=True
+            )
+            thread.start()
+
+    def _piper_speak_thread(self, text: str, cancel: threading.Event):
+        """Thread for non-blocking Piper speech."""
+        try:
+            self._speak_piper_stream(split_sentences([text]), None, cancel)
+        except Exception as e:
+            print(f"Piper TTS thread error: {e}")
+        finally:
+            self._end_utterance(cancel)
+
+    def _speak_piper_stream(self, sentences: Iterable[str],
+                            on_start: Optional[Callable[[], None]],
+                            cancel: threading.Event,
+                            spoken: Optional[List[str]] = None):
+        """
+        Synthesize sentences with Piper while a playback thread plays them.
+        Each sentence whose audio starts playing is appended to `spoken`.
+        """
+        worker = self._init_piper_worker()
+        audio_queue = queue.Queue()
+        player = PcmPlayer(worker.sample_rate if worker else TTS_SAMPLE_RATE)
+        self._player = player
+
+        def playback():
+            started = False
+            sentence = None  # Text of the audio that follows, until it plays
+            while True:
+                item = audio_queue.get()
+                if item is None:
+                    break
+                if cancel.is_set():
+                    continue  # Cancelled, drain remaining audio
+                if isinstance(item, str):
+                    sentence = item
+                    continue
+                if on_start and not started:
+                    started = True
+                    on_start()
+                if sentence is not None:
+                    if spoken is not None:
+                        spoken.append(sentence)
+                    sentence = None
+                player.write(item)
+            if not cancel.is_set():
+                player.finish()
+
+        thread = threading.Thread(target=playback, daemon=True)
+        thread.start()
+
+        try:
+            for sentence in sentences:
+                if cancel.is_set():
+                    break
+                audio_queue.put(sentence)
+                # Forward audio chunk by chunk so playback starts on the
+                # first chunk rather than after the whole sentence
+                for pcm in self._stream_piper_cached(sentence):
+                    if cancel.is_set():
+                        break
+                    audio_queue.put(pcm)
+        finally:
+            audio_queue.put(None)
+            thread.join()
+            if self._player is player:
+                self._player = None
+
+    def _synthesize_piper(self, text: str) -> Optional[bytes]:
+        """Synthesize one piece of text with Piper and return raw 16-bit mono PCM."""
+        return b"".join(self._stream_piper(text)) or None
+
+    def _stream_piper_cached(self, text: str) -> Iterator[bytes]:
+        """Like _stream_piper, but serve and store complete utterances in the cache."""
+        if self.cache is None:
+            yield from self._stream_piper(text)
+            return
+
+        key = self.cache.key(text, self.voice, self.speed)
+        pcm = self.cache.get(key)
+        if pcm is not None:
+            yield pcm
+            return
+
+        chunks = []
+        stream = self._stream_piper(text)
+        while True:
+            try:
+                chunk = next(stream)
+            except StopIteration as done:
+                completed = done.value
+                break
+            chunks.append(chunk)
+            yield chunk
+
+        # Only keep audio that was synthesized to the end
+        if completed:
+            self.cache.put(key, b"".join(chunks))
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the synthesized audio cache."""
+        return self.cache.stats() if self.cache else {}
+
+    def _stream_piper(self, text: str) -> Generator[bytes, None, bool]:
+        """
+        Synthesize text with Piper, yielding raw PCM chunks as they are produced.
+        Returns True if the whole text was synthesized without error.
+        """
+        worker = self._init_piper_worker()
+        if worker is None:
+            return (yield from self._stream_piper_cli(text))
+
+        job = worker.submit(text)
+        self._current_job = job
+        try:
+            yield from job.iter_chunks()
+        finally:
+            if self._current_job is job:
+                self._current_job = None
+        return job.completed
+
+    def _stream_piper_cli(self, text: str) -> Generator[bytes, None, bool]:
+        """
+        Run a one-off piper process on text, yielding its raw PCM output.
+        Returns True if piper exited cleanly.
+        """
+        timer = None
         try:
-            # Create temp file for audio
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
-                wav_path = f.name
-                
-            # Run Piper to generate audio
             piper_cmd = [
                 "piper",
                 "--model", self.voice,
-                "--output_file", wav_path
+                "--length_scale", str(1.0 / self.speed),
+                "--output_raw"
             ]
-            
-            self.current_process = subprocess.Popen(
+
+            process = subprocess.Popen(
                 piper_cmd,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                stderr=subprocess.DEVNULL
             )
-            
+            self.current_process = process
+            timer = threading.Timer(30, process.kill)
+            timer.start()
+
             # Send text to Piper
-            self.current_process.communicate(input=text.encode('utf-8'), timeout=30)
-            
-            if os.path.exists(wav_path) and os.path.getsize(wav_path) > 0:
-                # Play the audio
-                self._play_audio(wav_path, blocking)
-                
-            # Cleanup
-            try:
-                os.unlink(wav_path)
-            except OSError:
-                pass
-                
-        except subprocess.TimeoutExpired:
-            if self.current_process:
-                self.current_process.kill()
-            print("TTS timeout")
+            process.stdin.write(text.encode('utf-8'))
+            process.stdin.close()
+
+            # Piper writes audio as it synthesizes; pass it on chunk by chunk
+            while True:
+                chunk = process.stdout.read(PCM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+
+            if process.wait() == 0:
+                return True
+            if self.is_speaking:
+                print("TTS timeout" if not timer.is_alive() else "Piper TTS failed")
+
         except Exception as e:
             print(f"Piper TTS error: {e}")
-            # Fallback to pyttsx if available
-            if self._pyttsx_engine:
-                self._speak_pyttsx(text, blocking)
-                
+        finally:
+            if timer:
+                timer.cancel()
+        return False
+
     def _speak_pyttsx(self, text: str, blocking: bool):
         """Speak using pyttsx3."""
         if not self._pyttsx_engine:
@@ -173,47 +581,17 @@ class TextToSpeech:
         finally:
             self.is_speaking = False
             
-    def _play_audio(self, wav_path: str, blocking: bool):
-        """Play a WAV file."""
-        try:
-            if IS_RASPBERRY_PI:
-                # Use aplay on Linux/Pi
-                cmd = ["aplay", "-q", wav_path]
-            else:
-                # Use pygame on Windows
-                self._play_with_pygame(wav_path, blocking)
-                return
-                
-            if blocking:
-                self.current_process = subprocess.Popen(cmd)
-                self.current_process.wait()
-            else:
-                self.current_process = subprocess.Popen(cmd)
-                
-        except Exception as e:
-            print(f"Audio playback error: {e}")
-            
-    def _play_with_pygame(self, wav_path: str, blocking: bool):
-        """Play audio using pygame (for Windows)."""
-        try:
-            import pygame
-            pygame.mixer.init()
-            pygame.mixer.music.load(wav_path)
-            pygame.mixer.music.play()
-            
-            if blocking:
-                while pygame.mixer.music.get_busy():
-                    if not self.is_speaking:  # Cancelled
-                        pygame.mixer.music.stop()
-                        break
-                    pygame.time.wait(100)
-        except Exception as e:
-            print(f"Pygame audio error: {e}")
-            
     def stop(self):
         """Stop any ongoing speech."""
+        self._cancel.set()
         self.is_speaking = False
-        
+
+        # Stop streamed playback and pending synthesis
+        if self._player:
+            self._player.stop()
+        if self._current_job:
+            self._current_job.cancel()
+
         # Kill current process if running
         if self.current_process:
             try:
@@ -244,9 +622,17 @@ class TextToSpeech:
     def set_voice(self, voice: str):
         """Change the TTS voice."""
         self.voice = voice
+
+        # Reload the persistent worker with the new voice on next use
+        if self._piper_worker:
+            self._piper_worker.stop()
+        self._piper_worker = None
+        self._piper_worker_failed = False
         
     def set_speed(self, speed: float):
         """Change the speech speed (0.5 to 2.0)."""
         self.speed = max(0.5, min(2.0, speed))
+        if self._piper_worker:
+            self._piper_worker.length_scale = 1.0 / self.speed
         if self._pyttsx_engine:
             self._pyttsx_engine.setProperty('rate', int(150 * self.speed))
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Voice Activity Detection
+Frame-level speech detectors and an endpointer that decides when the user
+has finished speaking.
+"""
+
+import os
+import numpy as np
+from typing import Optional
+
+
+class VoiceActivityDetector:
+    """
+    Base class for frame-level speech detectors.
+    Subclasses classify fixed-size frames of 16-bit mono audio.
+    """
+
+    frame_size = 480  # Samples per frame (30 ms at 16 kHz)
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        raise NotImplementedError
+
+    def reset(self):
+        """Forget any state carried between frames."""
+
+    def calibrate(self, audio: np.ndarray):
+        """Learn the background level from audio recorded before listening starts."""
+
+
+class EnergyVAD(VoiceActivityDetector):
+    """
+    Energy + zero-crossing detector with an adaptive noise floor.
+
+    The noise floor follows the quietest recent frames (it drops quickly and
+    rises slowly, and is frozen during speech), so the threshold adapts to
+    the room instead of using a fixed amplitude. Frames well above the floor
+    are speech; frames moderately above it also count when their
+    zero-crossing rate looks like unvoiced speech (s, f, t sounds). Once in
+    speech, a lower threshold keeps quiet word endings from cutting it short.
+    """
+
+    def __init__(self, sample_rate: int, threshold_db: float = 9.0,
+                 min_level_db: float = -55.0):
+        super().__init__(sample_rate)
+        self.frame_size = int(sample_rate * 0.03)
+        self.threshold_db = threshold_db
+        self.min_level_db = min_level_db  # Below this (dBFS) is never speech
+        self.zcr_range = (0.1, 0.45)
+        self.noise_floor_db: Optional[float] = None
+        self._in_speech = False
+
+        # Scratch arrays, reused for every frame
+        self._x = np.empty(self.frame_size, dtype=np.float32)
+        self._sign = np.empty(self.frame_size, dtype=bool)
+        self._crossings = np.empty(self.frame_size - 1, dtype=bool)
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        x = self._x
+        np.copyto(x, frame, casting="unsafe")
+        x *= 1 / 32768.0
+        level_db = 10 * np.log10(float(np.dot(x, x)) / len(x) + 1e-10)
+        np.signbit(x, out=self._sign)
+        np.not_equal(self._sign[1:], self._sign[:-1], out=self._crossings)
+        zcr = np.count_nonzero(self._crossings) / len(x)
+
+        if self.noise_floor_db is None:
+            self.noise_floor_db = level_db
+
+        above = level_db - self.noise_floor_db
+        threshold = self.threshold_db / 2 if self._in_speech else self.threshold_db
+        speech = level_db > self.min_level_db and (
+            above > threshold
+            or (above > threshold / 2 and self.zcr_range[0] < zcr < self.zcr_range[1])
+        )
+        self._in_speech = speech
+
+        # Track the floor: fall fast, rise slowly, hold during speech
+        if level_db < self.noise_floor_db:
+            self.noise_floor_db += 0.5 * (level_db - self.noise_floor_db)
+        elif not speech:
+            self.noise_floor_db += 0.05 * (level_db - self.noise_floor_db)
+        return speech
+
+    def reset(self):
+        self.noise_floor_db = None
+        self._in_speech = False
+
+    def calibrate(self, audio: np.ndarray):
+        """Start the noise floor at the quieter frames of recent background audio."""
+        frames = len(audio) // self.frame_size
+        if frames == 0:
+            return
+        x = audio[:frames * self.frame_size].astype(np.float32).reshape(frames, -1) / 32768.0
+        levels_db = 10 * np.log10(np.einsum("ij,ij->i", x, x) / self.frame_size + 1e-10)
+        self.noise_floor_db = float(np.percentile(levels_db, 10))
+
+
+class WebRtcVAD(VoiceActivityDetector):
+    """Google WebRTC GMM detector (pip install webrtcvad)."""
+
+    def __init__(self, sample_rate: int, aggressiveness: int = 2):
+        super().__init__(sample_rate)
+        import webrtcvad
+        self.frame_size = int(sample_rate * 0.03)
+        self._vad = webrtcvad.Vad(aggressiveness)
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        return self._vad.is_speech(frame.tobytes(), self.sample_rate)
+
+
+class SileroVAD(VoiceActivityDetector):
+    """Silero neural detector (ONNX model, run with onnxruntime)."""
+
+    frame_size = 512
+
+    def __init__(self, sample_rate: int, threshold: float = 0.5,
+                 model_path: str = "models/silero_vad.onnx"):
+        super().__init__(sample_rate)
+        import onnxruntime
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(model_path)
+        self.threshold = threshold
+        self._session = onnxruntime.InferenceSession(
+            model_path, providers=["CPUExecutionProvider"]
+        )
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        self._input = np.empty((1, self.frame_size), dtype=np.float32)
+        self.reset()
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        x = self._input
+        np.copyto(x[0], frame, casting="unsafe")
+        x *= 1 / 32768.0
+        prob, self._state = self._session.run(
+            None, {"input": x, "state": self._state, "sr": self._sr}
+        )
+        return float(prob[0][0]) > self.threshold
+
+    def reset(self):
+        self._state = np.zeros((2, 1, 128), dtype=np.float32)
+
+
+def create_vad(backend: str, sample_rate: int, threshold_db: float = 9.0) -> VoiceActivityDetector:
+    """Create the configured detector, falling back to EnergyVAD if it is unavailable."""
+    try:
+        if backend == "webrtc":
+            return WebRtcVAD(sample_rate)
+        if backend == "silero":
+            return SileroVAD(sample_rate)
+    except ImportError as e:
+        print(f"Warning: VAD backend '{backend}' not installed ({e}). Using energy VAD.")
+    except Exception as e:
+        print(f"Warning: Could not load VAD backend '{backend}': {e}. Using energy VAD.")
+    return EnergyVAD(sample_rate, threshold_db=threshold_db)
+
+
+class Endpointer:
+    """
+    Turns frame decisions into start/end of speech.
+
+    Speech starts after `onset_ms` of consecutive speech frames and ends once
+    `hangover_ms` of non-speech follows it. If speech never starts within
+    `no_speech_timeout` seconds, the endpoint fires anyway.
+    """
+
+    def __init__(self, vad: VoiceActivityDetector, sample_rate: int,
+                 hangover_ms: float = 400, onset_ms: float = 90,
+                 no_speech_timeout: float = 3.0):
+        self.vad = vad
+        self.sample_rate = sample_rate
+        self.hangover_frames = max(1, int(hangover_ms / 1000 * sample_rate / vad.frame_size))
+        self.onset_frames = max(1, int(onset_ms / 1000 * sample_rate / vad.frame_size))
+        self.timeout_frames = int(no_speech_timeout * sample_rate / vad.frame_size)
+        self._frame = np.empty(vad.frame_size, dtype=np.int16)  # Frame split across calls
+        self.reset()
+
+    def reset(self):
+        self.vad.reset()
+        self.speech_started = False
+        self.done = False
+        self.frames = 0
+        self.speech_end: Optional[int] = None  # Sample offset where speech last ended
+        self._run = 0        # Consecutive speech frames before onset
+        self._silence = 0    # Consecutive non-speech frames after onset
+        self._filled = 0     # Samples of a partial frame held in self._frame
+
+    def process(self, samples: np.ndarray) -> bool:
+        """Feed audio; returns True once the endpoint has been reached."""
+        if self.done:
+            return True
+
+        size = self.vad.frame_size
+        i = 0
+
+        # Complete the frame left over from the previous call
+        if self._filled:
+            i = min(size - self._filled, len(samples))
+            self._frame[self._filled:self._filled + i] = samples[:i]
+            self._filled += i
+            if self._filled < size:
+                return False
+            self._filled = 0
+            if self._step(self._frame):
+                return True
+
+        # Whole frames are classified in place
+        while i + size <= len(samples):
+            if self._step(samples[i:i + size]):
+                return True
+            i += size
+
+        self._filled = len(samples) - i
+        self._frame[:self._filled] = samples[i:]
+        return False
+
+    def _step(self, frame: np.ndarray) -> bool:
+        """Classify one frame and update the endpoint state."""
+        speech = self.vad.is_speech(frame)
+        self.frames += 1
+
+        if not self.speech_started:
+            self._run = self._run + 1 if speech else 0
+            if self._run >= self.onset_frames:
+                self.speech_started = True
+            elif self.frames >= self.timeout_frames:
+                self.done = True
+        elif speech:
+            self._silence = 0
+        else:
+            if self._silence == 0:
+                self.speech_end = (self.frames - 1) * len(frame)
+            self._silence += 1
+            if self._silence >= self.hangover_frames:
+                self.done = True
+        return self.done
@@ -5,34 +5,49 @@ Handles wake word detection and speech-to-text transcription.
 """
 
 import os
+import json
 import threading
-import queue
+import time
 import numpy as np
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, List
 
 # Suppress ONNX Runtime GPU warning on Pi (no GPU available)
 os.environ["ORT_LOG_LEVEL"] = "3"
 
 from config import (
-    WAKE_WORD, WAKE_WORD_SENSITIVITY,
-    SAMPLE_RATE, AUDIO_CHANNELS, WHISPER_MODEL,
+    WAKE_WORD, WAKE_WORD_SENSITIVITY, WAKE_WORD_BACKEND, WAKE_WORD_MODEL, WAKE_WORD_GRAMMAR,
+    WAKE_WORD_PARTIALS, WAKE_WORD_COOLDOWN, WAKE_WORD_QUEUE_BLOCKS,
+    SAMPLE_RATE, AUDIO_CHANNELS, AUDIO_BLOCKSIZE, AUDIO_RING_SECONDS,
+    AUDIO_REPLAY_FILES, AUDIO_REPLAY_SPEED,
+    RECORDING_PREROLL, WHISPER_PROCESS,
+    STREAMING_TRANSCRIPTION, STREAMING_CHUNK_SECONDS, STREAMING_TAIL_SECONDS,
+    COMMAND_FAST_PATH, FAST_PATH_COMMANDS, FAST_PATH_MIN_CONFIDENCE,
+    VAD_BACKEND, VAD_HANGOVER_MS, VAD_THRESHOLD_DB, VAD_NO_SPEECH_TIMEOUT,
     IS_RASPBERRY_PI
 )
+from audio_capture import AudioCapture, AudioSource, SoundDeviceSource, WavFileSource, BlockQueue
+from streaming_transcriber import StreamingTranscriber, Segment
+from vad import Endpointer, create_vad
+from commands import CommandRecognizer
+from whisper_worker import WhisperWorker, segment_tuples
+from whisper_tuning import load_profile
+from wake_word import WakeWordDetector, VoskWakeWord, OnnxKeywordSpotter
 
 
 class VoiceRecognizer:
     """
     Voice recognition with wake word detection and speech transcription.
-    Uses Vosk for wake word and faster-whisper for transcription.
+    Uses Vosk (or a small keyword-spotting model) for wake word and
+    faster-whisper for transcription.
     """
     
-    def __init__(self):
+    def __init__(self, audio_source: Optional[AudioSource] = None):
         self.sample_rate = SAMPLE_RATE
         self.channels = AUDIO_CHANNELS
         
         # Audio recording state
         self.is_recording = False
-        self.audio_queue = queue.Queue()
+        self.audio_queue = BlockQueue(WAKE_WORD_QUEUE_BLOCKS)  # Bounded: stale audio is dropped
         
         # Wake word detection
         self.wake_word = WAKE_WORD.lower()
@@ -41,84 +56,226 @@ class VoiceRecognizer:
         self.wake_word_running = False
         self.wake_word_paused = False  # Pause during processing
         
+        # Latency metrics of the most recent turn
+        self.metrics: Dict[str, float] = {}
+        
         # Initialize components lazily
-        self._audio_interface = None
+        self._audio_source = audio_source  # Microphone unless given (e.g. WavFileSource)
+        self._capture: Optional[AudioCapture] = None
+        self._float_buffer: Optional[np.ndarray] = None
+        self._endpointer: Optional[Endpointer] = None
         self._whisper_model = None
+        self._whisper_worker: Optional[WhisperWorker] = None
+        self._whisper_settings = load_profile()  # model, compute_type, cpu_threads, beam_size
         self._vosk_model = None
         self._vosk_recognizer = None
+        self._wake_detector: Optional[WakeWordDetector] = None
+        self._commands: Optional[CommandRecognizer] = None
+        
+        # Components may be initialized from warm-up and worker threads at once
+        self._capture_lock = threading.Lock()
+        self._whisper_lock = threading.Lock()
+        self._vosk_lock = threading.Lock()
+        self._wake_lock = threading.Lock()
+        self._commands_lock = threading.Lock()
         
     def _init_audio(self):
-        """Initialize audio interface."""
-        if self._audio_interface is None:
-            try:
-                import sounddevice as sd
-                self._audio_interface = sd
-                print(f"Audio initialized: {sd.query_devices(kind='input')['name']}")
-            except Exception as e:
-                print(f"Warning: Could not initialize audio: {e}")
-                print("Voice features will be disabled.")
+        """Choose the audio source: the microphone, or WAV files to replay."""
+        if self._audio_source is None:
+            if AUDIO_REPLAY_FILES:
+                self._audio_source = WavFileSource(
+                    AUDIO_REPLAY_FILES, self.sample_rate, AUDIO_BLOCKSIZE,
+                    speed=AUDIO_REPLAY_SPEED
+                )
+            else:
+                try:
+                    import sounddevice as sd
+                    self._audio_source = SoundDeviceSource(
+                        sd, self.sample_rate, self.channels, AUDIO_BLOCKSIZE
+                    )
+                except Exception as e:
+                    print(f"Warning: Could not initialize audio: {e}")
+                    print("Voice features will be disabled.")
+                    return
+            print(f"Audio initialized: {self._audio_source.name}")
+
+    def _init_capture(self) -> Optional[AudioCapture]:
+        """Start the shared audio input (stays open until stop())."""
+        with self._capture_lock:
+            self._init_audio()
+            if self._capture is None and self._audio_source:
+                capture = AudioCapture(self.sample_rate, ring_seconds=AUDIO_RING_SECONDS)
+                if capture.start(self._audio_source):
+                    self._capture = capture
+                    # Preallocated once; recordings are converted into it in place
+                    self._float_buffer = np.empty(capture.ring.capacity, dtype=np.float32)
+            return self._capture
+
+    def _init_endpointer(self) -> Endpointer:
+        """Create the voice activity detector used to end recordings."""
+        if self._endpointer is None:
+            vad = create_vad(VAD_BACKEND, self.sample_rate, threshold_db=VAD_THRESHOLD_DB)
+            self._endpointer = Endpointer(
+                vad, self.sample_rate,
+                hangover_ms=VAD_HANGOVER_MS,
+                no_speech_timeout=VAD_NO_SPEECH_TIMEOUT
+            )
+        return self._endpointer
                 
     def _init_whisper(self):
         """Initialize Whisper model for transcription."""
-        if self._whisper_model is None:
-            try:
-                from faster_whisper import WhisperModel
-
-                print(f"Loading Whisper model '{WHISPER_MODEL}'...")
-                self._whisper_model = WhisperModel(
-                    WHISPER_MODEL,
-                    device="cpu",
-                    compute_type="int8"
+        with self._whisper_lock:
+            settings = self._whisper_settings
+            model_options = dict(
+                compute_type=settings["compute_type"],
+                cpu_threads=settings["cpu_threads"]
+            )
+            if WHISPER_PROCESS and self._whisper_worker is None and self._whisper_model is None:
+                print(f"Loading Whisper model '{settings['model']}' in a worker process...")
+                worker = WhisperWorker(
+                    settings["model"], self.sample_rate,
+                    max_seconds=AUDIO_RING_SECONDS,
+                    **model_options
                 )
-                print("Whisper model loaded!")
-            except ImportError:
-                print("Warning: faster-whisper not installed. Using mock transcription.")
-            except Exception as e:
-                print(f"Warning: Could not load Whisper: {e}")
-                print("Using mock transcription instead.")
+                if worker.start():
+                    self._whisper_worker = worker
+                    print("Whisper model loaded!")
+                else:
+                    print("Falling back to Whisper in the main process.")
+                    
+            if self._whisper_model is None and self._whisper_worker is None:
+                try:
+                    from faster_whisper import WhisperModel
+
+                    print(f"Loading Whisper model '{settings['model']}' "
+                          f"({settings['compute_type']}, threads={settings['cpu_threads'] or 'auto'})...")
+                    self._whisper_model = WhisperModel(
+                        settings["model"],
+                        device="cpu",
+                        **model_options
+                    )
+                    print("Whisper model loaded!")
+                except ImportError:
+                    print("Warning: faster-whisper not installed. Using mock transcription.")
+                except Exception as e:
+                    print(f"Warning: Could not load Whisper: {e}")
+                    print("Using mock transcription instead.")
                 
+    @property
+    def whisper_available(self) -> bool:
+        return self._whisper_model is not None or self._whisper_worker is not None
+        
     def _init_vosk(self):
         """Initialize Vosk for wake word detection."""
-        if self._vosk_model is None:
-            try:
-                from vosk import Model, KaldiRecognizer
-                import os
+        with self._vosk_lock:
+            if self._vosk_model is None:
+                try:
+                    from vosk import Model, KaldiRecognizer
+                    import os
                 
-                # Try to find Vosk model
-                model_path = "models/vosk-model-small-en-us-0.15"
-                if not os.path.exists(model_path):
-                    # Try alternative paths
-                    alt_paths = [
-                        os.path.expanduser("~/.cache/vosk/vosk-model-small-en-us-0.15"),
-                        "/usr/share/vosk/models/small-en-us",
-                    ]
-                    for path in alt_paths:
-                        if os.path.exists(path):
-                            model_path = path
-                            break
+                    # Try to find Vosk model
+                    model_path = "models/vosk-model-small-en-us-0.15"
+                    if not os.path.exists(model_path):
+                        # Try alternative paths
+                        alt_paths = [
+                            os.path.expanduser("~/.cache/vosk/vosk-model-small-en-us-0.15"),
+                            "/usr/share/vosk/models/small-en-us",
+                        ]
+                        for path in alt_paths:
+                            if os.path.exists(path):
+                                model_path = path
+                                break
                             
-                if os.path.exists(model_path):
-                    print(f"Loading Vosk model from {model_path}...")
-                    self._vosk_model = Model(model_path)
-                    self._vosk_recognizer = KaldiRecognizer(self._vosk_model, self.sample_rate)
-                    print("Vosk model loaded!")
-                else:
-                    print("Vosk model not found. Wake word detection disabled.")
-                    print("Download from: https://alphacephei.com/vosk/models")
-            except ImportError:
-                print("Warning: Vosk not installed. Wake word detection disabled.")
-            except Exception as e:
-                print(f"Warning: Could not load Vosk: {e}")
+                    if os.path.exists(model_path):
+                        print(f"Loading Vosk model from {model_path}...")
+                        self._vosk_model = Model(model_path)
+                        if WAKE_WORD_GRAMMAR:
+                            # Only the wake phrase or "something else": a tiny
+                            # decoding graph instead of the full vocabulary
+                            grammar = json.dumps([self.wake_word, "[unk]"])
+                            self._vosk_recognizer = KaldiRecognizer(
+                                self._vosk_model, self.sample_rate, grammar
+                            )
+                        else:
+                            self._vosk_recognizer = KaldiRecognizer(self._vosk_model, self.sample_rate)
+                        print("Vosk model loaded!")
+                    else:
+                        print("Vosk model not found. Wake word detection disabled.")
+                        print("Download from: https://alphacephei.com/vosk/models")
+                except ImportError:
+                    print("Warning: Vosk not installed. Wake word detection disabled.")
+                except Exception as e:
+                    print(f"Warning: Could not load Vosk: {e}")
+                
+    def _init_wake_word(self) -> Optional[WakeWordDetector]:
+        """Create the configured wake word backend, falling back to Vosk."""
+        with self._wake_lock:
+            if self._wake_detector is None and WAKE_WORD_BACKEND == "onnx":
+                try:
+                    self._wake_detector = OnnxKeywordSpotter(
+                        WAKE_WORD_MODEL, self.wake_word, self.sample_rate,
+                        threshold=1.0 - WAKE_WORD_SENSITIVITY,
+                        cooldown=WAKE_WORD_COOLDOWN
+                    )
+                    print(f"Keyword spotter loaded from {WAKE_WORD_MODEL}")
+                except ImportError:
+                    print("Warning: onnxruntime not installed. Using Vosk for the wake word.")
+                except Exception as e:
+                    print(f"Warning: Could not load keyword spotter: {e}. Using Vosk for the wake word.")
+                    
+            if self._wake_detector is None:
+                self._init_vosk()
+                if self._vosk_recognizer is not None:
+                    self._wake_detector = VoskWakeWord(
+                        self._vosk_recognizer, self.wake_word, self.sample_rate,
+                        use_partials=WAKE_WORD_PARTIALS, cooldown=WAKE_WORD_COOLDOWN
+                    )
+            return self._wake_detector
                 
+    def _init_commands(self) -> Optional[CommandRecognizer]:
+        """Create the command grammar recognizer for the fast path (shares the Vosk model)."""
+        with self._commands_lock:
+            if COMMAND_FAST_PATH and self._commands is None:
+                self._init_vosk()
+                if self._vosk_model is not None:
+                    try:
+                        self._commands = CommandRecognizer(
+                            self._vosk_model, self.sample_rate, FAST_PATH_COMMANDS,
+                            min_confidence=FAST_PATH_MIN_CONFIDENCE
+                        )
+                    except Exception as e:
+                        print(f"Warning: Could not create command recognizer: {e}")
+            return self._commands
+        
+    def warm_up_transcription(self) -> bool:
+        """Load Whisper and run a dummy transcription so the first real one is fast."""
+        self._init_whisper()
+        if not self.whisper_available:
+            return False
+        
+        # One second of faint noise; VAD off so the decoder actually runs
+        dummy = np.random.default_rng(0).normal(0, 0.01, self.sample_rate).astype(np.float32)
+        self._transcribe_segments(dummy, vad_filter=False)
+        return True
+        
+    def warm_up_wake_word(self) -> bool:
+        """Load the wake word backend and run a little silence through it."""
+        detector = self._init_wake_word()
+        if detector is None:
+            return False
+        detector.warm_up(self.sample_rate)
+        self._init_commands()
+        return True
+        
     def start_wake_word_detection(self, callback: Callable):
         """Start listening for wake word in background."""
-        self._init_audio()
-        self._init_vosk()
+        detector = self._init_wake_word()
+        capture = self._init_capture()
         
         self.wake_word_callback = callback
         self.wake_word_running = True
         
-        if self._vosk_recognizer and self._audio_interface:
+        if detector and capture:
             self.wake_word_thread = threading.Thread(
                 target=self._wake_word_loop,
                 daemon=True
@@ -130,127 +287,170 @@ class VoiceRecognizer:
             
     def _wake_word_loop(self):
         """Background thread for wake word detection."""
-        import json
-        
-        sd = self._audio_interface
-        
-        def audio_callback(indata, frames, time, status):
-            if status:
-                print(f"Audio status: {status}")
-            self.audio_queue.put(bytes(indata))
+        def on_audio(samples: np.ndarray):
+            if not self.wake_word_paused:  # Audio is not needed while processing
+                self.audio_queue.put(samples.copy())
             
+        self._capture.listeners.append(on_audio)
         try:
-            with sd.RawInputStream(
-                samplerate=self.sample_rate,
-                blocksize=8000,
-                dtype='int16',
-                channels=self.channels,
-                callback=audio_callback
-            ):
-                while self.wake_word_running:
-                    try:
-                        data = self.audio_queue.get(timeout=0.5)
-                        if self.wake_word_paused:
-                            continue  # Discard audio while processing
-                        if self._vosk_recognizer.AcceptWaveform(data):
-                            result = json.loads(self._vosk_recognizer.Result())
-                            text = result.get("text", "").lower()
-                            if self.wake_word in text:
-                                print(f"Wake word detected: '{text}'")
-                                if self.wake_word_callback:
-                                    self.wake_word_callback()
-                    except queue.Empty:
-                        continue
+            while self.wake_word_running:
+                samples = self.audio_queue.get(timeout=0.5)
+                if samples is None or self.wake_word_paused:
+                    continue
+                text = self._wake_detector.process(samples)
+                if text is not None:
+                    print(f"Wake word detected: '{text}'")
+                    self.audio_queue.clear()
+                    if self.wake_word_callback:
+                        self.wake_word_callback()
         except Exception as e:
             print(f"Wake word detection error: {e}")
+        finally:
+            self._capture.listeners.remove(on_audio)
             
+    def audio_stats(self) -> Dict[str, int]:
+        """Wake word queue and microphone stream health counters."""
+        stats = {
+            "dropped_blocks": self.audio_queue.dropped,
+            "queue_depth": len(self.audio_queue),
+            "queue_high_water": self.audio_queue.high_water,
+            "queue_size": self.audio_queue.maxsize,
+        }
+        if self._capture:
+            stats.update(self._capture.stats())
+        return stats
+        
+    def command_stats(self) -> Dict[str, float]:
+        """How often the command fast path answered, and how fast."""
+        return self._commands.stats() if self._commands else {}
+        
     def check_wake_word(self) -> bool:
         """Manual check for wake word (called from main loop)."""
         # This is handled in background thread now
         return False
         
-    def listen_and_transcribe(self, max_duration: float = 10.0) -> Optional[str]:
+    def listen_and_transcribe(self, max_duration: float = 10.0,
+                              preroll: float = RECORDING_PREROLL) -> Optional[str]:
         """
         Record audio and transcribe to text.
-        Records until silence is detected or max_duration is reached.
+        Records until the voice activity detector sees the end of speech
+        (or no speech at all) or max_duration is reached.
+        The recording starts `preroll` seconds in the past, so speech that
+        began right after the wake word is not lost.
         """
-        self._init_audio()
         self._init_whisper()
+        capture = self._init_capture()
         
-        if not self._audio_interface:
+        if not capture:
             return self._mock_transcription()
             
-        sd = self._audio_interface
+        ring = capture.ring
         
         print("Recording...")
         self.is_recording = True
         
+        streamer: Optional[StreamingTranscriber] = None
         try:
-            # Record audio
-            audio_data = []
-            silence_threshold = 500  # Adjust based on your mic
-            silence_duration = 0
-            max_silence = 1.5  # Seconds of silence before stopping
+            endpointer = self._init_endpointer()
+            endpointer.reset()
+            
+            now = ring.position
+            start = max(ring.oldest, now - int(preroll * self.sample_rate))
+            end = now + int(max_duration * self.sample_rate)
+            cursor = now
+            
+            # Seed the VAD's noise floor from the audio just before activation
+            endpointer.vad.calibrate(ring.read(now - 2 * self.sample_rate, now))
             
-            def callback(indata, frames, time, status):
-                if status:
-                    print(f"Recording status: {status}")
-                audio_data.append(indata.copy())
+            # Command grammar starts at activation: the pre-roll usually holds
+            # the end of the wake word, which would never match a command
+            commands = self._init_commands()
+            if commands:
+                commands.reset()
+            
+            # Decode in the background while the user is still speaking
+            if STREAMING_TRANSCRIPTION and self.whisper_available:
+                streamer = StreamingTranscriber(
+                    self._transcribe_segments, ring, start, self.sample_rate,
+                    chunk_seconds=STREAMING_CHUNK_SECONDS,
+                    tail_seconds=STREAMING_TAIL_SECONDS,
+                    buffer=self._float_buffer
+                )
+                streamer.start()
+            
+            # Wait for speech and the end of speech
+            while self.is_recording:
+                if not ring.wait(cursor, timeout=0.5):
+                    continue
+                # Look at the new audio in place, without copying it out
+                new_end = min(ring.position, end)
+                for part in ring.views(cursor, new_end):
+                    endpointer.process(part)
+                    if commands:
+                        commands.accept(part)
+                cursor = new_end
                 
-                # Check for silence
-                volume = np.abs(indata).mean()
-                nonlocal silence_duration
-                if volume < silence_threshold:
-                    silence_duration += frames / self.sample_rate
-                else:
-                    silence_duration = 0
-                    
-            with sd.InputStream(
-                samplerate=self.sample_rate,
-                channels=self.channels,
-                dtype='int16',
-                callback=callback
-            ):
-                # Wait for speech and silence
-                import time
-                start_time = time.time()
-                while self.is_recording:
-                    if time.time() - start_time > max_duration:
-                        print("Max duration reached")
-                        break
-                    if silence_duration > max_silence and len(audio_data) > 10:
-                        print("Silence detected")
-                        break
-                    time.sleep(0.1)
+                if endpointer.done:
+                    print("End of speech detected" if endpointer.speech_started
+                          else "No speech detected")
+                    break
+                if cursor >= end:
+                    print("Max duration reached")
+                    break
                     
             self.is_recording = False
             
-            if not audio_data:
-                return None
-                
-            # Combine audio chunks
-            audio = np.concatenate(audio_data, axis=0)
-            
-            # Convert to mono if stereo (take first channel)
-            if audio.ndim > 1:
-                audio = audio[:, 0]
+            speech_end = time.perf_counter()
             
-            # Ensure 1D
-            audio = audio.ravel()
+            if not endpointer.speech_started:
+                if streamer:
+                    streamer.cancel()
+                return None
             
-            audio_float = audio.astype(np.float32) / 32768.0
+            # A confidently recognized short command doesn't need Whisper
+            command = commands.result() if commands else None
+            if command:
+                if streamer:
+                    streamer.cancel()
+                latency_ms = (time.perf_counter() - speech_end) * 1000
+                commands.record(True, latency_ms)
+                self.metrics["final_latency_ms"] = latency_ms
+                print(f"Command fast path: '{command}' ({latency_ms:.0f} ms after end of speech)")
+                return command
             
-            print(f"Transcribing {len(audio_float)} samples...")
-            return self._transcribe(audio_float)
+            if streamer:
+                # Most of the recording is already decoded; finish the tail
+                speech_end_at = None
+                if endpointer.done and endpointer.speech_end is not None:
+                    speech_end_at = now + endpointer.speech_end
+                text = streamer.finish(min(cursor, end), speech_end=speech_end_at)
+                print(f"Streaming transcription: {streamer.passes} passes")
+            else:
+                # Single conversion pass into the reusable float32 buffer
+                audio_float = ring.read_float(start, min(cursor, end), out=self._float_buffer)
+                if len(audio_float) == 0:
+                    return None
+                    
+                print(f"Transcribing {len(audio_float)} samples...")
+                text = self._transcribe(audio_float)
+                
+            latency_ms = (time.perf_counter() - speech_end) * 1000
+            self.metrics["final_latency_ms"] = latency_ms
+            if commands:
+                commands.record(False, latency_ms)
+            print(f"Transcript ready {latency_ms:.0f} ms after end of speech")
+            return text
             
         except Exception as e:
             print(f"Recording error: {e}")
             self.is_recording = False
+            if streamer:
+                streamer.finish(streamer.committed)  # Stop the worker
             return None
             
     def _transcribe(self, audio: np.ndarray) -> Optional[str]:
         """Transcribe audio using Whisper."""
-        if self._whisper_model is None:
+        if not self.whisper_available:
             return self._mock_transcription()
         
         # Skip if audio is too short
@@ -259,20 +459,34 @@ class VoiceRecognizer:
             return None
             
         try:
-            segments, _ = self._whisper_model.transcribe(
-                audio,
-                language="en",
-                beam_size=1,  # Faster
-                best_of=1,
-                vad_filter=True
-            )
-            text = " ".join(segment.text for segment in segments).strip()
+            segments = self._transcribe_segments(audio)
+            text = " ".join(text for _, _, text in segments).strip()
             return text if text else None
             
         except Exception as e:
             print(f"Transcription error: {e}")
             return None
             
+    def _transcribe_segments(self, audio: np.ndarray, prompt: str = "",
+                             vad_filter: bool = True,
+                             word_timestamps: bool = False) -> List[Segment]:
+        """
+        Run Whisper and return (start, end, text) segments in seconds.
+        With word_timestamps, each word is returned as its own segment.
+        """
+        options = dict(
+            language="en",
+            beam_size=self._whisper_settings["beam_size"],  # 1 unless calibrated otherwise
+            best_of=1,
+            vad_filter=vad_filter,
+            initial_prompt=prompt or None,
+            word_timestamps=word_timestamps
+        )
+        if self._whisper_worker is not None:
+            return self._whisper_worker.transcribe(audio, **options)
+        segments, _ = self._whisper_model.transcribe(audio, **options)
+        return segment_tuples(segments, word_timestamps)
+            
     def _mock_transcription(self) -> str:
         """Return mock transcription for testing without audio."""
         import random
@@ -291,3 +505,7 @@ class VoiceRecognizer:
         self.wake_word_running = False
         if self.wake_word_thread:
             self.wake_word_thread.join(timeout=1.0)
+        if self._capture:
+            self._capture.stop()
+        if self._whisper_worker:
+            self._whisper_worker.stop()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Wake Word Spotting
+Turns microphone blocks into wake word detections, using either a
+grammar-restricted Vosk recognizer or a small ONNX keyword-spotting model.
+"""
+
+import os
+import json
+import numpy as np
+from typing import Optional
+
+
+class WakeWordDetector:
+    """
+    Base class for wake word backends.
+    process() is fed 16-bit mono capture blocks and returns the detected
+    text, or None.
+    """
+
+    def process(self, samples: np.ndarray) -> Optional[str]:
+        raise NotImplementedError
+
+    def reset(self):
+        """Forget audio heard so far."""
+
+    def warm_up(self, sample_rate: int):
+        """Run half a second of silence through the backend."""
+        self.process(np.zeros(sample_rate // 2, dtype=np.int16))
+        self.reset()
+
+
+class VoskWakeWord(WakeWordDetector):
+    """
+    Wake word spotter on top of a Vosk KaldiRecognizer.
+
+    With `use_partials` the partial hypothesis is checked after every block,
+    so the wake word fires as soon as it has been heard rather than when the
+    utterance ends. After a detection the recognizer is reset and audio is
+    ignored for `cooldown` seconds, so one utterance triggers only once.
+    """
+
+    def __init__(self, recognizer, wake_word: str, sample_rate: int,
+                 use_partials: bool = True, cooldown: float = 1.0):
+        self.recognizer = recognizer
+        self.wake_word = wake_word.lower()
+        self.use_partials = use_partials
+        self.cooldown_samples = int(cooldown * sample_rate)
+        self._cooldown_left = 0
+
+    def process(self, samples: np.ndarray) -> Optional[str]:
+        """Feed 16-bit mono audio; returns the recognized text on a detection."""
+        if self._cooldown_left > 0:
+            self._cooldown_left -= len(samples)
+            if self._cooldown_left <= 0:
+                self.recognizer.Reset()
+            return None
+
+        if self.recognizer.AcceptWaveform(samples.tobytes()):
+            text = json.loads(self.recognizer.Result()).get("text", "")
+        elif self.use_partials:
+            text = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        else:
+            return None
+
+        if self.wake_word not in text.lower():
+            return None
+        self.recognizer.Reset()
+        self._cooldown_left = self.cooldown_samples
+        return text
+
+    def reset(self):
+        self.recognizer.Reset()
+        self._cooldown_left = 0
+
+
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Triangular mel filters, shape (n_mels, n_fft // 2 + 1)."""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    mels = np.linspace(hz_to_mel(20.0), hz_to_mel(sample_rate / 2), n_mels + 2)
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    edges = mel_to_hz(mels)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+class MfccFrontEnd:
+    """
+    Streaming MFCC features (25 ms Hamming windows every 10 ms).
+    All frames of a block are computed at once with strided views and one
+    batched FFT; leftover samples carry over to the next block.
+    """
+
+    def __init__(self, sample_rate: int, n_mfcc: int = 13, n_mels: int = 40,
+                 n_fft: int = 512):
+        self.frame_length = int(sample_rate * 0.025)
+        self.hop = int(sample_rate * 0.010)
+        self.n_fft = n_fft
+        self.window = np.hamming(self.frame_length).astype(np.float32)
+        self.filters = mel_filterbank(sample_rate, n_fft, n_mels)
+        # Orthonormal DCT-II matrix, shape (n_mfcc, n_mels)
+        k = np.arange(n_mfcc)[:, None]
+        n = np.arange(n_mels)[None, :]
+        self.dct = (np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels))
+                    * np.sqrt(2.0 / n_mels)).astype(np.float32)
+        self.dct[0] /= np.sqrt(2.0)
+        self.reset()
+
+    def reset(self):
+        self._pending = np.zeros(0, dtype=np.float32)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Return the MFCC frames completed by these samples, shape (frames, n_mfcc)."""
+        audio = np.concatenate((self._pending, samples.astype(np.float32) / 32768.0))
+        count = 0 if len(audio) < self.frame_length else 1 + (len(audio) - self.frame_length) // self.hop
+        self._pending = audio[count * self.hop:]
+        if count == 0:
+            return np.zeros((0, len(self.dct)), dtype=np.float32)
+
+        step = audio.strides[0]
+        frames = np.lib.stride_tricks.as_strided(
+            audio, (count, self.frame_length), (self.hop * step, step), writeable=False
+        )
+        power = np.abs(np.fft.rfft(frames * self.window, self.n_fft)) ** 2
+        log_mel = np.log(power @ self.filters.T + 1e-6)
+        return log_mel @ self.dct.T
+
+
+class OnnxKeywordSpotter(WakeWordDetector):
+    """
+    Small keyword-spotting network (ONNX, run with onnxruntime) over the
+    last second or so of MFCC frames.
+
+    The model takes MFCCs shaped like its input (…, frames, n_mfcc) and
+    returns either one wake word probability or per-class probabilities; in
+    the latter case `<model>.labels` lists the classes, one per line. The
+    network only runs when the window is louder than `min_level_db`, so a
+    quiet room costs little more than the MFCCs. A detection needs the
+    average of the last `smoothing` probabilities above `threshold`.
+    """
+
+    def __init__(self, model_path: str, wake_word: str, sample_rate: int,
+                 threshold: float = 0.5, cooldown: float = 1.0,
+                 smoothing: int = 3, min_level_db: float = -50.0):
+        import onnxruntime
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(model_path)
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1  # Runs all the time; leave cores to Whisper
+        self._session = onnxruntime.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        frames, n_mfcc = [d if isinstance(d, int) else default
+                          for d, default in zip(model_input.shape[-2:], (98, 13))]
+        self._input_shape = [1] * (len(model_input.shape) - 2) + [frames, n_mfcc]
+        self.window_frames = frames
+        self.front_end = MfccFrontEnd(sample_rate, n_mfcc=self._input_shape[-1])
+
+        self.wake_word = wake_word.lower()
+        self.class_index = 0
+        labels_path = os.path.splitext(model_path)[0] + ".labels"
+        if os.path.exists(labels_path):
+            with open(labels_path) as f:
+                labels = [line.strip().lower().replace("_", " ") for line in f]
+            if self.wake_word not in labels:
+                raise ValueError(f"'{wake_word}' is not one of the model's classes: {labels}")
+            self.class_index = labels.index(self.wake_word)
+
+        self.threshold = threshold
+        self.smoothing = smoothing
+        self.min_level = 10 ** (min_level_db / 10)  # Mean power, full scale = 1
+        self.cooldown_samples = int(cooldown * sample_rate)
+        self.inferences = 0
+        self.reset()
+
+    def process(self, samples: np.ndarray) -> Optional[str]:
+        if self._cooldown_left > 0:
+            self._cooldown_left -= len(samples)
+            return None
+
+        features = self.front_end.process(samples)
+        self._features = np.concatenate((self._features, features))[-self.window_frames:]
+        x = samples.astype(np.float32) / 32768.0
+        self._levels = self._levels[1:] + [float(np.dot(x, x)) / max(len(x), 1)]
+        if len(self._features) < self.window_frames or max(self._levels) < self.min_level:
+            self._scores.clear()
+            return None
+
+        output = self._session.run(
+            None, {self._input_name: self._features.reshape(self._input_shape)}
+        )[0]
+        self.inferences += 1
+        self._scores = (self._scores + [float(output.ravel()[self.class_index])])[-self.smoothing:]
+        if len(self._scores) < self.smoothing or sum(self._scores) / self.smoothing < self.threshold:
+            return None
+
+        self.reset()
+        self._cooldown_left = self.cooldown_samples
+        return self.wake_word
+
+    def warm_up(self, sample_rate: int):
+        """Run the network once; the silence gate would otherwise skip it."""
+        zeros = np.zeros(self._input_shape, dtype=np.float32)
+        self._session.run(None, {self._input_name: zeros})
+
+    def reset(self):
+        self.front_end.reset()
+        self._features = np.zeros((0, self._input_shape[-1]), dtype=np.float32)
+        self._levels = [0.0] * 10  # Recent block levels (about one second)
+        self._scores = []
+        self._cooldown_left = 0
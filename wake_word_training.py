@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Wake Word Training
+Trains the small keyword-spotting network used by the "onnx" wake word
+backend on your own recordings and exports it to ONNX.
+
+Features come from the same MfccFrontEnd the detector runs, so the model
+always matches its input contract: (1, 98, 13) MFCC frames (about one
+second) in, one wake word probability out. The network normalizes the
+MFCCs, then applies one hidden ReLU layer and a sigmoid output. Training
+uses numpy only; writing the model file needs `pip install onnx`.
+
+Recordings are 16 kHz mono 16-bit WAV files in one directory with a
+labels.json mapping each file name to {"wake_end": seconds}, or to
+{"wake_end": null} for clips without the wake word (the same fixtures as
+benchmarks/eval_wake_word.py). A few dozen positives from the people and
+room that will use the assistant, plus a few minutes of negatives
+(talking, TV, other phrases, silence), are a reasonable start.
+
+Usage:
+    python wake_word_training.py --fixtures benchmarks/fixtures/wake
+                                 [--output models/wake_word.onnx]
+                                 [--hidden 32] [--epochs 40] [--augment 4]
+"""
+
+import argparse
+import json
+import os
+import wave
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import SAMPLE_RATE, AUDIO_BLOCKSIZE, WAKE_WORD, WAKE_WORD_MODEL
+from wake_word import MfccFrontEnd, OnnxKeywordSpotter
+
+WINDOW_FRAMES = 98  # MFCC frames per model input (~1 s)
+N_MFCC = 13
+LEAD_SILENCE = 1.0  # Seconds of silence before each clip, so early windows are full
+
+# A window counts as positive if it ends this long after the labelled end
+# of the wake phrase (the detector averages a few consecutive windows)
+POSITIVE_RANGE = (0.0, 0.3)
+# Windows ending this close before the end only hold part of the phrase;
+# they are left out rather than taught as negatives
+PARTIAL_MARGIN = 0.3
+
+
+def load_fixtures(directory: Path) -> List[Tuple[str, np.ndarray, Optional[float]]]:
+    """Return (name, int16 audio, wake_end or None) for every labelled clip."""
+    labels = json.loads((directory / "labels.json").read_text())
+    clips = []
+    for name, label in sorted(labels.items()):
+        with wave.open(str(directory / name), "rb") as w:
+            if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1 or w.getsampwidth() != 2:
+                raise ValueError(f"{name}: expected {SAMPLE_RATE} Hz mono 16-bit")
+            audio = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        clips.append((name, audio, label.get("wake_end")))
+    return clips
+
+
+def augment(audio: np.ndarray, count: int, rng: np.random.Generator) -> List[np.ndarray]:
+    """The clip plus `count` copies at other levels with background noise."""
+    variants = [audio]
+    for _ in range(count):
+        gain = 10 ** rng.uniform(-0.5, 0.3)
+        noise = rng.normal(0, 10 ** rng.uniform(0.5, 2.5), len(audio))
+        mixed = audio.astype(np.float32) * gain + noise
+        variants.append(np.clip(mixed, -32768, 32767).astype(np.int16))
+    return variants
+
+
+def windows(audio: np.ndarray, wake_end: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """MFCC windows of one clip with their 0/1 labels."""
+    lead = np.zeros(int(LEAD_SILENCE * SAMPLE_RATE), dtype=np.int16)
+    tail = np.zeros(SAMPLE_RATE // 2, dtype=np.int16)
+    front_end = MfccFrontEnd(SAMPLE_RATE, n_mfcc=N_MFCC)
+    mfcc = front_end.process(np.concatenate((lead, audio, tail)))
+
+    # Clip time at which the window ending with frame i is complete
+    frame_end = (np.arange(len(mfcc)) * front_end.hop + front_end.frame_length) / SAMPLE_RATE
+    frame_end -= LEAD_SILENCE
+
+    features, labels = [], []
+    for end in range(WINDOW_FRAMES, len(mfcc) + 1):
+        t = frame_end[end - 1]
+        if wake_end is None:
+            label = 0
+        elif POSITIVE_RANGE[0] <= t - wake_end <= POSITIVE_RANGE[1]:
+            label = 1
+        elif wake_end - PARTIAL_MARGIN < t < wake_end + WINDOW_FRAMES / 100:
+            continue  # Partial phrase, or the phrase still inside the window
+        else:
+            label = 0
+        if label == 0 and end % 4:
+            continue  # Neighbouring negatives are nearly identical
+        features.append(mfcc[end - WINDOW_FRAMES:end])
+        labels.append(label)
+    if not features:
+        return np.zeros((0, WINDOW_FRAMES, N_MFCC), np.float32), np.zeros(0, np.float32)
+    return np.stack(features).astype(np.float32), np.array(labels, dtype=np.float32)
+
+
+def build_dataset(clips: list, augment_count: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    features, labels = [], []
+    for _, audio, wake_end in clips:
+        for variant in augment(audio, augment_count, rng):
+            x, y = windows(variant, wake_end)
+            features.append(x)
+            labels.append(y)
+    return np.concatenate(features), np.concatenate(labels)
+
+
+def init_params(hidden: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """Untrained network weights (also used by benchmarks to time inference)."""
+    rng = np.random.default_rng(seed)
+    n_in = WINDOW_FRAMES * N_MFCC
+    return {
+        "mean": np.zeros(N_MFCC, np.float32),
+        "std": np.ones(N_MFCC, np.float32),
+        "w1": rng.normal(0, np.sqrt(2 / n_in), (n_in, hidden)).astype(np.float32),
+        "b1": np.zeros(hidden, np.float32),
+        "w2": rng.normal(0, np.sqrt(1 / hidden), (hidden, 1)).astype(np.float32),
+        "b2": np.zeros(1, np.float32),
+    }
+
+
+def train(features: np.ndarray, labels: np.ndarray, hidden: int, epochs: int,
+          lr: float = 1e-3, batch: int = 64, weight_decay: float = 1e-4,
+          seed: int = 0) -> Dict[str, np.ndarray]:
+    """Fit the network with Adam on class-balanced binary cross-entropy."""
+    params = init_params(hidden, seed)
+    params["mean"] = features.mean(axis=(0, 1))
+    params["std"] = features.std(axis=(0, 1)) + 1e-6
+    x_all = ((features - params["mean"]) / params["std"]).reshape(len(features), -1)
+
+    positives = labels.sum()
+    pos_weight = (len(labels) - positives) / max(positives, 1)
+    trained = ("w1", "b1", "w2", "b2")
+    moments = {k: (np.zeros_like(params[k]), np.zeros_like(params[k])) for k in trained}
+    rng = np.random.default_rng(seed)
+    step = 0
+
+    for epoch in range(1, epochs + 1):
+        order = rng.permutation(len(x_all))
+        total_loss = 0.0
+        for i in range(0, len(order), batch):
+            idx = order[i:i + batch]
+            x, y = x_all[idx], labels[idx]
+            h = np.maximum(x @ params["w1"] + params["b1"], 0)
+            logit = (h @ params["w2"] + params["b2"])[:, 0]
+            p = 1 / (1 + np.exp(-np.clip(logit, -30, 30)))
+            weight = np.where(y == 1, pos_weight, 1.0).astype(np.float32)
+            total_loss -= float(np.sum(weight * (y * np.log(p + 1e-7) + (1 - y) * np.log(1 - p + 1e-7))))
+
+            g = (p - y) * weight / weight.sum()  # d loss / d logit
+            grads = {"w2": h.T @ g[:, None], "b2": g.sum(keepdims=True)}
+            gh = g[:, None] @ params["w2"].T
+            gh[h <= 0] = 0
+            grads["w1"] = x.T @ gh
+            grads["b1"] = gh.sum(axis=0)
+
+            step += 1
+            for k in trained:
+                grad = grads[k] + weight_decay * params[k]
+                m, v = moments[k]
+                m[:] = 0.9 * m + 0.1 * grad
+                v[:] = 0.999 * v + 0.001 * grad ** 2
+                m_hat = m / (1 - 0.9 ** step)
+                v_hat = v / (1 - 0.999 ** step)
+                params[k] -= (lr * m_hat / (np.sqrt(v_hat) + 1e-8)).astype(np.float32)
+        if epoch % 10 == 0 or epoch == epochs:
+            print(f"  epoch {epoch:3d}: loss {total_loss / len(x_all):.4f}")
+    return params
+
+
+def export_onnx(params: Dict[str, np.ndarray], path: Path):
+    """Write the network as ONNX: mfcc (1, 98, 13) -> probability (1, 1)."""
+    import onnx
+    from onnx import helper, numpy_helper, TensorProto
+
+    initializers = [
+        numpy_helper.from_array(params["mean"].reshape(1, 1, N_MFCC).astype(np.float32), "mean"),
+        numpy_helper.from_array(params["std"].reshape(1, 1, N_MFCC).astype(np.float32), "std"),
+        numpy_helper.from_array(np.array([1, -1], dtype=np.int64), "flat_shape"),
+        numpy_helper.from_array(params["w1"].astype(np.float32), "w1"),
+        numpy_helper.from_array(params["b1"].astype(np.float32), "b1"),
+        numpy_helper.from_array(params["w2"].astype(np.float32), "w2"),
+        numpy_helper.from_array(params["b2"].astype(np.float32), "b2"),
+    ]
+    nodes = [
+        helper.make_node("Sub", ["mfcc", "mean"], ["centered"]),
+        helper.make_node("Div", ["centered", "std"], ["normalized"]),
+        helper.make_node("Reshape", ["normalized", "flat_shape"], ["flat"]),
+        helper.make_node("Gemm", ["flat", "w1", "b1"], ["hidden"]),
+        helper.make_node("Relu", ["hidden"], ["activated"]),
+        helper.make_node("Gemm", ["activated", "w2", "b2"], ["logit"]),
+        helper.make_node("Sigmoid", ["logit"], ["probability"]),
+    ]
+    graph = helper.make_graph(
+        nodes, "wake_word",
+        [helper.make_tensor_value_info("mfcc", TensorProto.FLOAT, [1, WINDOW_FRAMES, N_MFCC])],
+        [helper.make_tensor_value_info("probability", TensorProto.FLOAT, [1, 1])],
+        initializers
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8  # Loadable by the older onnxruntime builds on the Pi
+    onnx.checker.check_model(model)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    onnx.save(model, str(path))
+
+
+def evaluate(model_path: Path, clips: list, threshold: float) -> Dict[str, int]:
+    """Stream held-out clips through the real detector; count hits and false triggers."""
+    detector = OnnxKeywordSpotter(str(model_path), WAKE_WORD, SAMPLE_RATE, threshold=threshold)
+    result = {"positives": 0, "detected": 0, "negatives": 0, "false_triggers": 0}
+    lead = np.zeros(int(LEAD_SILENCE * SAMPLE_RATE), dtype=np.int16)
+    tail = np.zeros(SAMPLE_RATE, dtype=np.int16)
+    for _, audio, wake_end in clips:
+        detector.reset()
+        audio = np.concatenate((lead, audio, tail))
+        detected = any(
+            detector.process(audio[i:i + AUDIO_BLOCKSIZE]) is not None
+            for i in range(0, len(audio), AUDIO_BLOCKSIZE)
+        )
+        if wake_end is None:
+            result["negatives"] += 1
+            result["false_triggers"] += detected
+        else:
+            result["positives"] += 1
+            result["detected"] += detected
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", type=Path, default=Path("benchmarks/fixtures/wake"))
+    parser.add_argument("--output", type=Path, default=Path(WAKE_WORD_MODEL))
+    parser.add_argument("--hidden", type=int, default=32)
+    parser.add_argument("--epochs", type=int, default=40)
+    parser.add_argument("--augment", type=int, default=4, help="noisy copies per clip")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    args = parser.parse_args()
+
+    if not (args.fixtures / "labels.json").exists():
+        print(f"No labels.json in {args.fixtures}")
+        return
+    clips = load_fixtures(args.fixtures)
+    positives = [c for c in clips if c[2] is not None]
+    negatives = [c for c in clips if c[2] is None]
+    if not positives or not negatives:
+        print("Need clips both with and without the wake word")
+        return
+
+    # Hold out every fifth clip of each kind to check the exported model
+    held_out = positives[::5] + negatives[::5] if len(clips) >= 10 else []
+    training = [c for c in clips if c not in held_out]
+
+    features, labels = build_dataset(training, args.augment)
+    print(f"Training on {len(training)} clips: {len(labels)} windows, "
+          f"{int(labels.sum())} positive")
+    params = train(features, labels, args.hidden, args.epochs)
+
+    try:
+        export_onnx(params, args.output)
+    except ImportError:
+        print("onnx is not installed (pip install onnx)")
+        return
+    print(f"Model written to {args.output}")
+
+    # A labels file belongs to a multi-class model; this one has one output
+    labels_path = args.output.with_suffix(".labels")
+    if labels_path.exists():
+        os.remove(labels_path)
+        print(f"Removed {labels_path} (not used by a single-output model)")
+
+    if held_out:
+        result = evaluate(args.output, held_out, args.threshold)
+        print(f"Held-out clips: {result['detected']}/{result['positives']} detected, "
+              f"{result['false_triggers']}/{result['negatives']} false triggers")
+
+
+if __name__ == "__main__":
+    main()
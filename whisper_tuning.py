@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Whisper Tuning
+Calibrates Whisper settings for the machine it runs on: benchmarks
+candidate (model, compute_type, cpu_threads, beam_size) combinations on
+reference clips, measures real-time factor (RTF) and word error rate
+(WER), and writes the most accurate combination that meets the target
+RTF to a profile that VoiceRecognizer loads at startup.
+
+Reference clips are 16 kHz mono 16-bit WAV files, each with a .txt file
+of the same name holding the correct transcript.
+
+Usage:
+    python whisper_tuning.py [--clips benchmarks/fixtures/whisper] [--target-rtf 0.5]
+                             [--models tiny,base] [--compute-types int8]
+                             [--threads 2,4] [--beams 1,2]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import time
+import wave
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    SAMPLE_RATE, WHISPER_MODEL, WHISPER_PROFILE, WHISPER_TARGET_RTF,
+    IS_RASPBERRY_PI, PI_MODEL
+)
+
+# Used when there is no profile for this machine
+DEFAULT_SETTINGS = {
+    "model": WHISPER_MODEL,
+    "compute_type": "int8",
+    "cpu_threads": 0,  # 0 = let CTranslate2 decide
+    "beam_size": 1,
+}
+
+
+def machine_name() -> str:
+    return PI_MODEL.strip("\x00 \n")
+
+
+def load_profile(path: Path = WHISPER_PROFILE) -> Dict:
+    """Whisper settings for this machine: the calibrated profile, or the defaults."""
+    settings = dict(DEFAULT_SETTINGS)
+    if not path.exists():
+        return settings
+    try:
+        profile = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read Whisper profile {path}: {e}")
+        return settings
+    if profile.get("machine") != machine_name():
+        print(f"Whisper profile was calibrated on '{profile.get('machine')}', ignoring it")
+        return settings
+    settings.update({key: profile[key] for key in DEFAULT_SETTINGS if key in profile})
+    return settings
+
+
+def normalize(text: str) -> List[str]:
+    return re.sub(r"[^a-z0-9' ]", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance divided by the reference length."""
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    if not ref:
+        return float(bool(hyp))
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        previous, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (r != h))
+    return row[-1] / len(ref)
+
+
+def load_clips(directory: Path) -> List[Tuple[str, np.ndarray, str]]:
+    """(name, float32 audio, reference transcript) for every WAV with a .txt."""
+    clips = []
+    for wav_path in sorted(directory.glob("*.wav")):
+        txt_path = wav_path.with_suffix(".txt")
+        if not txt_path.exists():
+            continue
+        with wave.open(str(wav_path), "rb") as w:
+            if w.getframerate() != SAMPLE_RATE or w.getnchannels() != 1 or w.getsampwidth() != 2:
+                raise ValueError(f"{wav_path.name}: expected {SAMPLE_RATE} Hz mono 16-bit")
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        clips.append((wav_path.name, pcm.astype(np.float32) / 32768.0, txt_path.read_text()))
+    return clips
+
+
+def default_candidates() -> Dict[str, list]:
+    """Search space that makes sense for this kind of machine."""
+    cores = os.cpu_count() or 1
+    threads = sorted({t for t in (1, 2, 4, cores) if t <= cores})
+    if IS_RASPBERRY_PI and "Pi 5" not in machine_name():
+        models = ["tiny", "base"]
+    else:
+        models = ["tiny", "base", "small"]
+    return {"models": models, "compute_types": ["int8"], "threads": threads, "beams": [1, 2]}
+
+
+def measure(model, clips: list, beam_size: int) -> Tuple[float, float]:
+    """Return (real-time factor, mean WER) of one model over the clips."""
+    # Warm up; segments are decoded lazily, so consume them
+    segments, _ = model.transcribe(
+        clips[0][1], language="en", beam_size=beam_size, best_of=1, vad_filter=True
+    )
+    list(segments)
+    decode_seconds, audio_seconds, errors = 0.0, 0.0, []
+    for _, audio, reference in clips:
+        start = time.perf_counter()
+        segments, _ = model.transcribe(
+            audio, language="en", beam_size=beam_size, best_of=1, vad_filter=True
+        )
+        text = " ".join(segment.text for segment in segments)
+        decode_seconds += time.perf_counter() - start
+        audio_seconds += len(audio) / SAMPLE_RATE
+        errors.append(word_error_rate(reference, text))
+    return decode_seconds / audio_seconds, sum(errors) / len(errors)
+
+
+def choose(results: List[Dict], target_rtf: float) -> Dict:
+    """Most accurate result within the target RTF (fastest if none qualifies)."""
+    within = [r for r in results if r["rtf"] <= target_rtf]
+    if within:
+        return min(within, key=lambda r: (round(r["wer"], 3), r["rtf"]))
+    print(f"No combination meets RTF {target_rtf}; using the fastest")
+    return min(results, key=lambda r: r["rtf"])
+
+
+def calibrate(clips: list, models: list, compute_types: list, threads: list,
+              beams: list, target_rtf: float) -> Optional[Dict]:
+    from faster_whisper import WhisperModel
+
+    results = []
+    print(f"{'model':<8} {'compute':<9} {'threads':>7} {'beam':>4} {'RTF':>6} {'WER':>6}")
+    for model_name, compute_type, cpu_threads in itertools.product(models, compute_types, threads):
+        try:
+            model = WhisperModel(model_name, device="cpu", compute_type=compute_type,
+                                 cpu_threads=cpu_threads)
+        except Exception as e:
+            print(f"{model_name:<8} {compute_type:<9} {cpu_threads:>7} unavailable: {e}")
+            continue
+        for beam_size in beams:
+            rtf, wer = measure(model, clips, beam_size)
+            print(f"{model_name:<8} {compute_type:<9} {cpu_threads:>7} {beam_size:>4} "
+                  f"{rtf:6.2f} {wer:6.1%}")
+            results.append({"model": model_name, "compute_type": compute_type,
+                            "cpu_threads": cpu_threads, "beam_size": beam_size,
+                            "rtf": round(rtf, 3), "wer": round(wer, 4)})
+        del model
+    return choose(results, target_rtf) if results else None
+
+
+def main():
+    candidates = default_candidates()
+    parser = argparse.ArgumentParser(description="Calibrate Whisper settings for this machine")
+    parser.add_argument("--clips", type=Path, default=Path("benchmarks/fixtures/whisper"))
+    parser.add_argument("--target-rtf", type=float, default=WHISPER_TARGET_RTF,
+                        help="max decoding seconds per second of audio")
+    parser.add_argument("--models", default=",".join(candidates["models"]))
+    parser.add_argument("--compute-types", default=",".join(candidates["compute_types"]))
+    parser.add_argument("--threads", default=",".join(map(str, candidates["threads"])))
+    parser.add_argument("--beams", default=",".join(map(str, candidates["beams"])))
+    parser.add_argument("--output", type=Path, default=WHISPER_PROFILE)
+    args = parser.parse_args()
+
+    clips = load_clips(args.clips)
+    if not clips:
+        print(f"No reference clips (WAV + .txt transcript) in {args.clips}")
+        return
+    total = sum(len(audio) for _, audio, _ in clips) / SAMPLE_RATE
+    print(f"Calibrating on {machine_name()}: {len(clips)} clips, {total:.0f} s of audio\n")
+
+    try:
+        best = calibrate(
+            clips, args.models.split(","), args.compute_types.split(","),
+            [int(t) for t in args.threads.split(",")], [int(b) for b in args.beams.split(",")],
+            args.target_rtf
+        )
+    except ImportError:
+        print("faster-whisper is not installed")
+        return
+    if best is None:
+        print("No combination could be measured")
+        return
+
+    profile = {"machine": machine_name(), "target_rtf": args.target_rtf, **best}
+    args.output.write_text(json.dumps(profile, indent=2) + "\n")
+    print(f"\nBest: {best['model']} {best['compute_type']} threads={best['cpu_threads']} "
+          f"beam={best['beam_size']} (RTF {best['rtf']:.2f}, WER {best['wer']:.1%})")
+    print(f"Profile written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
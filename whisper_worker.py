@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Whisper Worker Process
+Keeps the faster-whisper model resident in a separate process, so decoding
+does not compete with the render loop and wake word thread for the GIL.
+Audio is handed over through shared memory; only small messages (sample
+count, options, resulting segments) go through the pipe.
+"""
+
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from typing import List, Optional, Tuple
+
+# (start seconds, end seconds, text)
+Segment = Tuple[float, float, str]
+
+
+def segment_tuples(segments, word_timestamps: bool = False) -> List[Segment]:
+    """Flatten faster-whisper segments (or their words, if timestamped) into tuples."""
+    if word_timestamps:
+        return [(w.start, w.end, w.word) for s in segments for w in (s.words or [])]
+    return [(s.start, s.end, s.text) for s in segments]
+
+
+def _serve(conn, shm_name: str, capacity: int, model_name: str, model_options: dict):
+    """Worker process main loop: load the model, then answer requests."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    audio = np.ndarray((capacity,), dtype=np.float32, buffer=shm.buf)
+    try:
+        from faster_whisper import WhisperModel
+        model = WhisperModel(model_name, device="cpu", **model_options)
+        conn.send(("ready", None))
+    except Exception as e:
+        conn.send(("error", str(e)))
+        model = None
+
+    while model is not None:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        count, options = request
+        try:
+            segments, _ = model.transcribe(audio[:count], **options)
+            conn.send(("ok", segment_tuples(segments, options.get("word_timestamps", False))))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+    del audio  # Release the view before closing the mapping
+    shm.close()
+
+
+class WhisperWorker:
+    """
+    Parent-side handle of the transcription process.
+    transcribe() copies the audio into shared memory (one memcpy, no
+    pickling) and blocks until the segments come back. Calls from several
+    threads are serialized.
+    """
+
+    def __init__(self, model_name: str, sample_rate: int, max_seconds: float,
+                 **model_options):
+        self.model_name = model_name
+        self.model_options = model_options
+        self.capacity = int(sample_rate * max_seconds)
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._audio: Optional[np.ndarray] = None
+        self._conn = None
+        self._process = None
+        self._lock = threading.Lock()
+
+    def start(self, timeout: float = 300.0) -> bool:
+        """Launch the process and wait until the model is loaded."""
+        self._shm = shared_memory.SharedMemory(create=True, size=self.capacity * 4)
+        self._audio = np.ndarray((self.capacity,), dtype=np.float32, buffer=self._shm.buf)
+
+        # Spawn rather than fork: the parent already runs audio and UI threads
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_serve,
+            args=(child_conn, self._shm.name, self.capacity, self.model_name, self.model_options),
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+
+        if not self._conn.poll(timeout):
+            print("Whisper worker did not start in time")
+            self.stop()
+            return False
+        status, error = self._conn.recv()
+        if status != "ready":
+            print(f"Whisper worker failed to load the model: {error}")
+            self.stop()
+            return False
+        return True
+
+    def transcribe(self, audio: np.ndarray, **options) -> List[Segment]:
+        """Transcribe float32 audio (truncated to the shared buffer size)."""
+        with self._lock:
+            if self._process is None:
+                raise RuntimeError("Whisper worker is not running")
+            count = min(len(audio), self.capacity)
+            self._audio[:count] = audio[:count]
+            try:
+                self._conn.send((count, options))
+                status, payload = self._conn.recv()
+            except (EOFError, OSError):
+                raise RuntimeError("Whisper worker exited")
+            if status != "ok":
+                raise RuntimeError(payload)
+            return payload
+
+    def stop(self):
+        """Shut the process down and free the shared memory."""
+        with self._lock:
+            if self._process is not None:
+                try:
+                    self._conn.send(None)
+                except (OSError, ValueError):
+                    pass
+                self._process.join(timeout=2)
+                if self._process.is_alive():
+                    self._process.terminate()
+                self._conn.close()
+                self._process = None
+            if self._shm is not None:
+                self._audio = None
+                self._shm.close()
+                self._shm.unlink()
+                self._shm = None